@@ -2,7 +2,7 @@
 # pylint: disable=expression-not-assigned,line-too-long,missing-module-docstring
 import sys
 
-from arbejdstimer.cli import app
+from arbejdstimer.fast import main
 
 if __name__ == '__main__':
-    sys.exit(app(prog_name='arbejdstimer'))  # pragma: no cover
+    sys.exit(main())  # pragma: no cover
@@ -3,6 +3,7 @@
 """Working hours (Danish arbejdstimer) or not? API model."""
 from __future__ import annotations
 
+from calendar import monthrange
 from datetime import date
 from enum import Enum
 from typing import Annotated, List, Optional, no_type_check
@@ -80,6 +81,162 @@ class Holidays(
     pass
 
 
+class HolidayRule(BaseModel):
+    label: Annotated[Optional[str], Field(examples=['christmas eve'])] = ''
+    month: Annotated[
+        Optional[int],
+        Field(
+            description='Month of year (January is 1) of fixed day or nth weekday rules.',
+            ge=1,
+            le=12,
+            title='Month',
+        ),
+    ] = None
+    day: Annotated[
+        Optional[int],
+        Field(description='Day of month of fixed day rules.', ge=1, le=31, title='Day of Month'),
+    ] = None
+    weekday: Annotated[
+        Optional[int],
+        Field(description='ISO weekday (Monday is 1) of nth weekday rules.', ge=1, le=7, title='Weekday'),
+    ] = None
+    nth: Annotated[
+        Optional[int],
+        Field(
+            description='Occurrence of the weekday within the month counting from the end if negative.',
+            ge=-5,
+            le=5,
+            title='Nth Weekday',
+        ),
+    ] = None
+    easter: Annotated[
+        Optional[int],
+        Field(
+            description='Offset in days from easter sunday (western computus).',
+            ge=-366,
+            le=366,
+            title='Offset from Easter',
+        ),
+    ] = None
+
+    @no_type_check
+    @model_validator(mode='after')
+    def is_one_rule(self):
+        given = {name for name in ('month', 'day', 'weekday', 'nth', 'easter') if getattr(self, name) is not None}
+        if given not in ({'month', 'day'}, {'month', 'weekday', 'nth'}, {'easter'}):
+            raise ValueError('rule must be one of month and day, month and weekday and nth, or easter')
+        if self.nth == 0:
+            raise ValueError('nth must not be zero')
+        if self.day is not None and self.day > monthrange(2000, self.month)[1]:
+            raise ValueError(f'day ({self.day}) does not exist in month ({self.month})')
+        return self
+
+
+class HolidayRules(
+    RootModel[
+        Annotated[
+            List[HolidayRule],
+            Field(
+                description='Optionally labeled rules of non-working days recurring every year.',
+                min_length=0,
+                title='Holiday Rules',
+            ),
+        ]
+    ]
+):
+    pass
+
+
+class Weekmask(
+    RootModel[
+        Annotated[
+            str,
+            Field(
+                description='Workdays of the week as seven characters 0 or 1 starting with Monday.',
+                examples=['1111100'],
+                pattern='^[01]{7}$',
+                title='Weekmask',
+            ),
+        ]
+    ]
+):
+    @no_type_check
+    @model_validator(mode='after')
+    def has_workday(self):
+        if '1' not in self.root:
+            raise ValueError('weekmask must hold at least one workday')
+        return self
+
+
+class Clock(
+    RootModel[
+        Annotated[
+            str,
+            Field(
+                description='24 hour clock time HH:MM where 24:00 is the end of the day.',
+                examples=['08:30'],
+                pattern='^(([01][0-9]|2[0-3]):[0-5][0-9]|24:00)$',
+                title='Clock Time',
+            ),
+        ]
+    ]
+):
+    pass
+
+
+class ClockRange(
+    RootModel[
+        Annotated[
+            List[Clock],
+            Field(
+                description='Half-open range of start and end clock times.',
+                max_length=2,
+                min_length=2,
+                title='Clock Range',
+            ),
+        ]
+    ]
+):
+    @no_type_check
+    @model_validator(mode='after')
+    def is_increasing(self):
+        start, end = (clock.root for clock in self.root)
+        if start >= end:
+            raise ValueError(f'shift start ({start}) must be before end ({end})')
+        return self
+
+
+class Weekday(RootModel[Annotated[int, Field(ge=1, le=7)]]):
+    pass
+
+
+class Shift(BaseModel):
+    label: Annotated[Optional[str], Field(examples=['support desk'])] = ''
+    weekdays: Annotated[
+        List[Weekday],
+        Field(description='ISO weekdays (Monday is 1) the shifts apply to.', min_length=1, title='Weekdays'),
+    ]
+    at: Annotated[
+        List[ClockRange],
+        Field(description='Clock ranges of work time on the weekdays.', min_length=1, title='Shifts'),
+    ]
+
+
+class Shifts(
+    RootModel[
+        Annotated[
+            List[Shift],
+            Field(
+                description='Work time per weekday replacing the working hours on the weekdays given.',
+                min_length=0,
+                title='Shifts',
+            ),
+        ]
+    ]
+):
+    pass
+
+
 class Arbejdstimer(BaseModel):
     api: Annotated[
         Optional[int],
@@ -103,4 +260,7 @@ class Arbejdstimer(BaseModel):
         ),
     ]
     holidays: Optional[Holidays] = None
+    holiday_rules: Optional[HolidayRules] = None
+    weekmask: Optional[Weekmask] = None
     working_hours: Optional[WorkingHours] = None
+    shifts: Optional[Shifts] = None
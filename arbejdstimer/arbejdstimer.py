@@ -1,19 +1,22 @@
 """Working hours (Danish arbejdstimer) or not? API."""
 
-import copy
+import bisect
+import calendar
 import datetime as dti
+import functools
 import json
 import os
 import pathlib
 import sys
+from collections.abc import Iterable, Iterator, Sequence
 from typing import Tuple, Union, no_type_check
 
-from pydantic import ValidationError
+import arbejdstimer.cache as cache
+import arbejdstimer.trace as trace
 
-import arbejdstimer.api as api
-
-DEBUG_VAR = 'ARBEJDSTIMER_DEBUG'
+DEBUG_VAR = trace.DEBUG_VAR
 DEBUG = os.getenv(DEBUG_VAR)
+TRACE = trace.tracer(DEBUG or '')
 
 ENCODING = 'utf-8'
 ENCODING_ERRORS_POLICY = 'ignore'
@@ -22,10 +25,256 @@ DEFAULT_CONFIG_NAME = '.arbejdstimer.json'
 CfgType = dict[str, Union[dict[str, str], list[dict[str, Union[str, list[str]]]]]]
 WorkingHoursType = Union[tuple[int, int], tuple[None, None]]
 CmdType = Tuple[str, str, str, bool]
+RuleType = tuple[Union[str, int], ...]
+ShiftsType = tuple[tuple[tuple[int, int], ...], ...]
 DATE_FMT = '%Y-%m-%d'
 YEAR_MONTH_FORMAT = '%Y-%m'
 DEFAULT_WORK_HOURS_MARKER = (None, None)
 DEFAULT_WORK_HOURS_CLOSED_INTERVAL = (7, 16)
+OPERATOR_AND = 'and'
+OPERATOR_OR = 'or'
+OPERATOR_XOR = 'xor'
+OPERATORS = (OPERATOR_AND, OPERATOR_OR, OPERATOR_XOR)
+DEFAULT_WEEKMASK = 0b0011111  # bit n set if ISO weekday n + 1 is a workday (Monday to Friday)
+FULL_WEEKMASK = 0b1111111
+MINUTES_PER_DAY = 24 * 60
+WEEKDAY_NAMES = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+ROLL_FORWARD = ('forward', 'following')
+ROLL_BACKWARD = ('backward', 'preceding')
+ROLL_MODIFIED_FORWARD = 'modifiedfollowing'
+ROLL_MODIFIED_BACKWARD = 'modifiedpreceding'
+ROLL_RAISE = 'raise'
+ROLL_MODES = (*ROLL_FORWARD, *ROLL_BACKWARD, ROLL_MODIFIED_FORWARD, ROLL_MODIFIED_BACKWARD, ROLL_RAISE)
+RULE_FIXED = 'fixed'  # (kind, month, day)
+RULE_NTH = 'nth'  # (kind, month, ISO weekday, nth from start or from end if negative)
+RULE_EASTER = 'easter'  # (kind, offset in days from easter sunday)
+RULE_KINDS = (RULE_FIXED, RULE_NTH, RULE_EASTER)
+
+
+def merge_intervals(pairs: Iterable[tuple[int, int]]) -> list[tuple[int, int]]:
+    """Return the closed intervals sorted and merged (overlapping or adjacent ones) into non-overlapping ones."""
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(pairs):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class OffDays(Sequence):  # type: ignore
+    """Holidays as sorted, merged, and non-overlapping closed intervals of date ordinals.
+
+    Membership is answered per bisection over the interval starts and the dates are only expanded
+    when a caller iterates over the sequence or explicitly asks per dates().
+    The operator states how the holidays combine with the weekend rule given by the weekmask (default or).
+    Recurring rules are kept apart from the sequence and only expanded per year when asked for by rule_days().
+    The shifts optionally replace the working hours per ISO weekday by half-open intervals of minutes of the day.
+    """
+
+    intervals: list[tuple[int, int]]
+    starts: list[int]
+    offsets: list[int]
+    total: int
+    operator: str
+    rules: tuple[RuleType, ...]
+    weekmask: int
+    shifts: ShiftsType
+
+    @no_type_check
+    def __init__(self, dates=(), intervals=(), operator=OPERATOR_OR, rules=(), weekmask=DEFAULT_WEEKMASK, shifts=()):
+        if operator not in OPERATORS:
+            raise ValueError(f'unknown operator ({operator})')
+        if not 0 < weekmask <= FULL_WEEKMASK:
+            raise ValueError(f'weekmask ({weekmask}) must select at least one and at most seven weekdays')
+        self.operator = operator
+        self.weekmask = weekmask
+        if shifts and len(shifts) != 7:
+            raise ValueError('shifts must be given for all seven weekdays (empty ones use the working hours)')
+        self.shifts = tuple(merge_shifts(day) for day in shifts) if any(shifts) else ()
+        self.rules = tuple(sorted(set(tuple(rule) for rule in rules)))
+        for rule in self.rules:
+            if rule[0] not in RULE_KINDS:
+                raise ValueError(f'unknown rule kind ({rule[0]})')
+        ordinals = ((day.toordinal(), day.toordinal()) for day in dates)
+        self.intervals = merge_intervals([*ordinals, *(tuple(pair) for pair in intervals)])
+        self.starts = [start for start, _ in self.intervals]
+        self.offsets = []
+        total = 0
+        for start, end in self.intervals:
+            self.offsets.append(total)
+            total += end - start + 1
+        self.total = total
+
+    def contains_ordinal(self, ordinal: int) -> bool:
+        """Return if the date ordinal is within any of the intervals."""
+        slot = bisect.bisect_right(self.starts, ordinal) - 1
+        return slot >= 0 and ordinal <= self.intervals[slot][1]
+
+    def rule_days(self, year: int) -> tuple[int, ...]:
+        """Return the sorted date ordinals within the year given by the recurring rules."""
+        return rule_days(self.rules, year) if self.rules else ()
+
+    @no_type_check
+    def __contains__(self, day) -> bool:
+        try:
+            return self.contains_ordinal(day.toordinal())
+        except AttributeError:
+            return False
+
+    def __len__(self) -> int:
+        return self.total
+
+    @no_type_check
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self.dates()[item]
+        if item < 0:
+            item += self.total
+        if not 0 <= item < self.total:
+            raise IndexError('off days index out of range')
+        slot = bisect.bisect_right(self.offsets, item) - 1
+        return dti.date.fromordinal(self.intervals[slot][0] + item - self.offsets[slot])
+
+    def __iter__(self) -> Iterator[dti.date]:
+        for start, end in self.intervals:
+            for ordinal in range(start, end + 1):
+                yield dti.date.fromordinal(ordinal)
+
+    @no_type_check
+    def __eq__(self, other) -> bool:
+        if isinstance(other, OffDays):
+            mine = (self.operator, self.rules, self.weekmask, self.shifts)
+            theirs = (other.operator, other.rules, other.weekmask, other.shifts)
+            return self.intervals == other.intervals and mine == theirs
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return len(other) == self.total and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self) -> str:
+        operator = f', operator={self.operator!r}' if self.operator != OPERATOR_OR else ''
+        rules = f', rules={self.rules!r}' if self.rules else ''
+        weekmask = f', weekmask={format_weekmask(self.weekmask)!r}' if self.weekmask != DEFAULT_WEEKMASK else ''
+        shifts = f', shifts={self.shifts!r}' if self.shifts else ''
+        return f'OffDays(intervals={self.intervals!r}{operator}{rules}{weekmask}{shifts})'
+
+    def dates(self) -> list[dti.date]:
+        """Return the expanded list of holiday dates."""
+        return list(self)
+
+
+@no_type_check
+def holiday_index(off_days) -> OffDays:
+    """Return the off days as index (reusing an existing one)."""
+    return off_days if isinstance(off_days, OffDays) else OffDays(off_days)
+
+
+class WorkdayIndex:
+    """Per-day and per-month prefix sums over the date ordinals of workdays.
+
+    Counting the workdays of any closed date interval is then two lookups in the dense per-day table.
+    """
+
+    days: list[dti.date]
+    base: int
+    prefix: list[int]
+    months: dict[tuple[int, int], int]
+    cumulative_months: dict[tuple[int, int], int]
+
+    @no_type_check
+    def __init__(self, work_days=()):
+        self.days = sorted(work_days)
+        self.base = self.days[0].toordinal() if self.days else 0
+        span = self.days[-1].toordinal() - self.base + 1 if self.days else 0
+        self.prefix = [0] * (span + 1)
+        for work_day in self.days:
+            self.prefix[work_day.toordinal() - self.base + 1] += 1
+        for slot in range(1, span + 1):
+            self.prefix[slot] += self.prefix[slot - 1]
+        self.months = month_counts(self.days)
+        self.cumulative_months = running_totals(self.months)
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def count_until(self, ordinal: int) -> int:
+        """Return the count of workdays up to and including the date ordinal."""
+        slot = ordinal - self.base + 1
+        if slot <= 0:
+            return 0
+        return self.prefix[min(slot, len(self.prefix) - 1)]
+
+    def count_between(self, first: int, last: int) -> int:
+        """Return the count of workdays within the closed interval of date ordinals."""
+        if last < first:
+            return 0
+        return self.count_until(last) - self.count_until(first - 1)
+
+
+@no_type_check
+def month_counts(work_days, years=None) -> dict[tuple[int, int], int]:
+    """Return the workday count per integer (year, month) in a single pass optionally confined to the years."""
+    per = {}
+    key, count = None, 0
+    for work_day in work_days:
+        if years is not None and work_day.year not in years:
+            continue
+        if (work_day.year, work_day.month) != key:
+            if key is not None:
+                per[key] = per.get(key, 0) + count
+            key, count = (work_day.year, work_day.month), 0
+        count += 1
+    if key is not None:
+        per[key] = per.get(key, 0) + count
+    return per
+
+
+def running_totals(per: dict[tuple[int, int], int]) -> dict[tuple[int, int], int]:
+    """Return the running total of the counts in order of the keys."""
+    cum, running = {}, 0
+    for key, count in per.items():
+        running += count
+        cum[key] = running
+    return cum
+
+
+def year_month_label(key: tuple[int, int]) -> str:
+    """Return the year-month string of the integer (year, month) pair."""
+    return f'{key[0]:04d}-{key[1]:02d}'
+
+
+@no_type_check
+def workday_index(work_days) -> WorkdayIndex:
+    """Return the workdays as prefix sum index (reusing an existing one)."""
+    return work_days if isinstance(work_days, WorkdayIndex) else WorkdayIndex(work_days)
+
+
+@no_type_check
+def month_key(month) -> Union[tuple[int, int], None]:
+    """Return the integer (year, month) pair of a year-month string or None if malformed."""
+    try:
+        year, month_of_year = (int(part) for part in month.split('-'))
+    except (AttributeError, ValueError):
+        return None
+    return (year, month_of_year) if 1 <= month_of_year <= 12 else None
+
+
+def month_first_ordinal(key: tuple[int, int]) -> int:
+    """Return the ordinal of the first day of the month."""
+    return dti.date(*key, 1).toordinal()
+
+
+def month_last_ordinal(key: tuple[int, int]) -> int:
+    """Return the ordinal of the last day of the month."""
+    return month_first_ordinal(key) + calendar.monthrange(*key)[1] - 1
+
+
+def month_day_ordinal(key: tuple[int, int], day: int) -> int:
+    """Return the ordinal of the day of month clamped to the month (day zero and below are the day before)."""
+    return month_first_ordinal(key) + min(max(day, 0), calendar.monthrange(*key)[1]) - 1
 
 
 @no_type_check
@@ -46,9 +295,74 @@ def weekday(date: dti.date) -> int:
     return date.isoweekday()
 
 
-def no_weekend(day_number: int) -> bool:
-    """Return if day number is weekend."""
-    return day_number < 6
+def no_weekend(day_number: int, weekmask: int = DEFAULT_WEEKMASK) -> bool:
+    """Return if day number (ISO weekday) is no weekend day per weekmask (default Monday to Friday)."""
+    return bool(weekmask >> (day_number - 1) & 1)
+
+
+def parse_weekmask(text: str) -> int:
+    """Return the weekmask from the seven characters 0 or 1 starting with Monday (e.g. 1111100)."""
+    if len(text) != 7 or set(text) - {'0', '1'}:
+        raise ValueError(f'weekmask ({text}) must be seven characters 0 or 1 starting with Monday')
+    return sum(1 << n for n, flag in enumerate(text) if flag == '1')
+
+
+def format_weekmask(weekmask: int) -> str:
+    """Return the weekmask as seven characters 0 or 1 starting with Monday."""
+    return ''.join('1' if weekmask >> n & 1 else '0' for n in range(7))
+
+
+def parse_clock(text: str) -> int:
+    """Return the minute of the day from the 24 hour clock time HH:MM (24:00 is the end of the day)."""
+    hours, separator, minutes = text.partition(':')
+    if not separator or len(minutes) != 2 or not hours.isdigit() or not minutes.isdigit() or int(minutes) > 59:
+        raise ValueError(f'clock time ({text}) must be given as HH:MM')
+    minute = int(hours) * 60 + int(minutes)
+    if minute > MINUTES_PER_DAY:
+        raise ValueError(f'clock time ({text}) must be within [00:00, 24:00]')
+    return minute
+
+
+def format_clock(minute: int) -> str:
+    """Return the minute of the day as 24 hour clock time HH:MM."""
+    return f'{minute // 60:02d}:{minute % 60:02d}'
+
+
+@no_type_check
+def merge_shifts(shifts) -> tuple[tuple[int, int], ...]:
+    """Return the half-open intervals of minutes of the day sorted and merged (overlapping or adjacent ones)."""
+    pairs = [tuple(pair) for pair in shifts]
+    for start, end in pairs:
+        if not 0 <= start < end <= MINUTES_PER_DAY:
+            raise ValueError(f'shift [{start}, {end}) must be a non-empty interval within [0, {MINUTES_PER_DAY}]')
+    return tuple((start, end + 1) for start, end in merge_intervals((start, end - 1) for start, end in pairs))
+
+
+def hour_shifts(hours: tuple[int, int]) -> tuple[tuple[int, int], ...]:
+    """Return the closed interval of working hours as half-open interval of minutes of the day."""
+    return ((hours[0] * 60, (hours[1] + 1) * 60),)
+
+
+def minute_mask(shifts: Iterable[tuple[int, int]]) -> int:
+    """Return the bits of the minutes of the day within the half-open intervals (bit n is minute n)."""
+    bits = 0
+    for start, end in shifts:
+        bits |= ((1 << (end - start)) - 1) << start
+    return bits
+
+
+@no_type_check
+def effective_shifts(holidays, working_hours: WorkingHoursType = DEFAULT_WORK_HOURS_MARKER) -> ShiftsType:
+    """Return the shifts per ISO weekday from the holidays falling back on the (default) working hours."""
+    hours = working_hours if working_hours != DEFAULT_WORK_HOURS_MARKER else DEFAULT_WORK_HOURS_CLOSED_INTERVAL
+    fallback = hour_shifts(tuple(hours))
+    shifts = holidays.shifts if isinstance(holidays, OffDays) and holidays.shifts else ((),) * 7
+    return tuple(day or fallback for day in shifts)
+
+
+def day_minute(day: dti.date, minute: int, tzinfo: Union[dti.tzinfo, None] = None) -> dti.datetime:
+    """Return the date time of the minute of the day (1440 is midnight of the next day)."""
+    return dti.datetime.combine(day, dti.time(), tzinfo=tzinfo) + dti.timedelta(minutes=minute)
 
 
 def the_hour() -> int:
@@ -56,6 +370,580 @@ def the_hour() -> int:
     return dti.datetime.now().hour
 
 
+def the_minute() -> int:
+    """Return the minute of the hour as integer within [0, 59]."""
+    return dti.datetime.now().minute
+
+
+def the_day() -> dti.date:
+    """Return the current date."""
+    return dti.date.today()
+
+
+def the_moment() -> dti.datetime:
+    """Return the current local date time."""
+    return dti.datetime.now()
+
+
+def iso_weekday(ordinal: int) -> int:
+    """Return the ISO weekday (Monday is 1) of the date ordinal."""
+    return (ordinal + 6) % 7 + 1
+
+
+def weekdays_until(ordinal: int) -> int:
+    """Return the count of Monday to Friday dates from the first date ordinal (a Monday) up to ordinal (incl.)."""
+    weeks, rest = divmod(max(ordinal, 0), 7)
+    return weeks * 5 + min(rest, 5)
+
+
+def weekday_count(first: int, last: int) -> int:
+    """Return the count of Monday to Friday dates within the closed interval of date ordinals."""
+    if last < first:
+        return 0
+    return weekdays_until(last) - weekdays_until(first - 1)
+
+
+if sys.version_info >= (3, 10):
+
+    def popcount(bits: int) -> int:
+        """Return the count of set bits."""
+        return bits.bit_count()
+
+else:  # pragma: no cover
+
+    def popcount(bits: int) -> int:
+        """Return the count of set bits."""
+        return bin(bits).count('1')
+
+
+def lowest_bit(bits: int) -> int:
+    """Return the position of the lowest set bit (bits must not be 0)."""
+    return (bits & -bits).bit_length() - 1
+
+
+def nth_bit(bits: int, n: int) -> int:
+    """Return the position of the n-th (counting from 1) lowest set bit per bisection over the bit positions."""
+    low, high = 0, bits.bit_length() - 1
+    while low < high:
+        middle = (low + high) // 2
+        if popcount(bits & ((2 << middle) - 1)) < n:
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def year_start(year: int) -> int:
+    """Return the date ordinal of the first day of the year."""
+    return dti.date(year, 1, 1).toordinal()
+
+
+def year_length(year: int) -> int:
+    """Return the count of days of the year."""
+    return 366 if calendar.isleap(year) else 365
+
+
+@functools.lru_cache(maxsize=None)
+def weekmask_bits(first_iso_weekday: int, days: int, weekmask: int) -> int:
+    """Return the bits of the days of a year starting at the ISO weekday whose weekday is set in the weekmask."""
+    shift = first_iso_weekday - 1
+    week = ((weekmask >> shift) | (weekmask << (7 - shift))) & FULL_WEEKMASK
+    bits = 0
+    for start in range(0, days, 7):
+        bits |= week << start
+    return bits & ((1 << days) - 1)
+
+
+def interval_bits(intervals: list[tuple[int, int]], starts: list[int], first: int, last: int) -> int:
+    """Return the bits (relative to first) of the days within the closed intervals clipped to [first, last]."""
+    bits = 0
+    for slot in range(max(bisect.bisect_right(starts, first) - 1, 0), len(intervals)):
+        start, end = intervals[slot]
+        if start > last:
+            break
+        if end < first:
+            continue
+        start, end = max(start, first), min(end, last)
+        bits |= ((1 << (end - start + 1)) - 1) << (start - first)
+    return bits
+
+
+def easter_sunday(year: int) -> dti.date:
+    """Return the date of easter sunday in the year (anonymous gregorian computus)."""
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    j = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * j) // 451
+    month, day = divmod(h + j - 7 * m + 114, 31)
+    return dti.date(year, month, day + 1)
+
+
+def nth_weekday(year: int, month: int, iso_weekday_number: int, nth: int) -> Union[int, None]:
+    """Return the date ordinal of the nth (from the end if negative) ISO weekday of the month or None."""
+    first = dti.date(year, month, 1).toordinal()
+    last = first + calendar.monthrange(year, month)[1] - 1
+    if nth > 0:
+        ordinal = first + (iso_weekday_number - iso_weekday(first)) % 7 + 7 * (nth - 1)
+    else:
+        ordinal = last - (iso_weekday(last) - iso_weekday_number) % 7 + 7 * (nth + 1)
+    return ordinal if first <= ordinal <= last else None
+
+
+@functools.lru_cache(maxsize=None)
+def rule_days(rules: tuple[RuleType, ...], year: int) -> tuple[int, ...]:
+    """Return the sorted date ordinals within the year given by the recurring rules (memoized per year)."""
+    first, last = year_start(year), year_start(year) + year_length(year) - 1
+    ordinals = set()
+    for kind, *values in rules:
+        numbers = [int(value) for value in values]
+        if kind == RULE_FIXED:
+            month, day = numbers
+            if day <= calendar.monthrange(year, month)[1]:
+                ordinals.add(dti.date(year, month, day).toordinal())
+        elif kind == RULE_NTH:
+            ordinal = nth_weekday(year, *numbers)
+            if ordinal is not None:
+                ordinals.add(ordinal)
+        else:  # offsets may reach into the neighbouring years
+            for easter_year in range(max(year - 1, dti.MINYEAR), min(year + 1, dti.MAXYEAR) + 1):
+                ordinal = easter_sunday(easter_year).toordinal() + numbers[0]
+                if first <= ordinal <= last:
+                    ordinals.add(ordinal)
+    return tuple(sorted(ordinals))
+
+
+@no_type_check
+def rule_of(holiday_rule) -> RuleType:
+    """Return the recurring rule as tuple from the dumped model of a holiday rule."""
+    if holiday_rule['easter'] is not None:
+        return RULE_EASTER, holiday_rule['easter']
+    if holiday_rule['nth'] is not None:
+        return RULE_NTH, holiday_rule['month'], holiday_rule['weekday'], holiday_rule['nth']
+    return RULE_FIXED, holiday_rule['month'], holiday_rule['day']
+
+
+@no_type_check
+def combine_off(operator: str, weekend, holiday):
+    """Combine the default off days (weekend) with the configured off days (holiday) per operator.
+
+    Works alike on integer bitsets and boolean arrays.
+    """
+    if operator == OPERATOR_AND:
+        return weekend & holiday
+    if operator == OPERATOR_XOR:
+        return weekend ^ holiday
+    return weekend | holiday
+
+
+class Calendar:
+    """Immutable calendar engine holding the holiday index, working hours, and year bounds.
+
+    All queries are free of side effects, explanations are returned as lists of notes.
+    Every year is represented by bitsets of its workdays and holidays combined from the weekend rule
+    and the configured holidays per operator (computed at construction for the configured years
+    and memoized on first use for all other years) so a day check is a single bit test and searching
+    or counting workdays costs a few big integer operations per year.
+    The work time of the day is given per ISO weekday as shifts of minutes with a bitset of 1440 bits each,
+    so checking a minute of a workday is another single bit test.
+    """
+
+    __slots__ = (
+        'holidays',
+        'working_hours',
+        'hours',
+        'first_year',
+        'last_year',
+        'operator',
+        'weekmask',
+        'masks',
+        'shifts',
+        'minute_masks',
+        'shift_minutes',
+    )
+
+    holidays: OffDays
+    working_hours: WorkingHoursType
+    hours: tuple[int, int]
+    first_year: Union[int, None]
+    last_year: Union[int, None]
+    operator: str
+    weekmask: int
+    masks: dict[int, tuple[int, int]]
+    shifts: ShiftsType
+    minute_masks: tuple[int, ...]
+    shift_minutes: tuple[int, ...]
+
+    @no_type_check
+    def __init__(self, holidays=(), working_hours: WorkingHoursType = DEFAULT_WORK_HOURS_MARKER):
+        holidays = holiday_index(holidays)
+        hours = working_hours if working_hours != DEFAULT_WORK_HOURS_MARKER else DEFAULT_WORK_HOURS_CLOSED_INTERVAL
+        object.__setattr__(self, 'holidays', holidays)
+        object.__setattr__(self, 'working_hours', tuple(working_hours))
+        object.__setattr__(self, 'hours', tuple(hours))
+        object.__setattr__(self, 'first_year', holidays[0].year if holidays else None)
+        object.__setattr__(self, 'last_year', holidays[-1].year if holidays else None)
+        object.__setattr__(self, 'operator', holidays.operator)
+        object.__setattr__(self, 'weekmask', holidays.weekmask)
+        object.__setattr__(self, 'masks', {})
+        shifts = effective_shifts(holidays, working_hours)
+        object.__setattr__(self, 'shifts', shifts)
+        object.__setattr__(self, 'minute_masks', tuple(minute_mask(day) for day in shifts))
+        object.__setattr__(self, 'shift_minutes', tuple(sum(end - start for start, end in day) for day in shifts))
+        if holidays:
+            for year in range(self.first_year, self.last_year + 1):
+                self.year_masks(year)
+
+    @no_type_check
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{self.__class__.__name__} is immutable')
+
+    @no_type_check
+    def __delattr__(self, name):
+        raise AttributeError(f'{self.__class__.__name__} is immutable')
+
+    def __repr__(self) -> str:
+        return f'Calendar(holidays={self.holidays!r}, working_hours={self.working_hours!r})'
+
+    def year_masks(self, year: int) -> tuple[int, int]:
+        """Return the bitsets of workdays and holidays of the year (bit n is the day n + 1 of the year)."""
+        masks = self.masks.get(year)
+        if masks is None:
+            first, days = year_start(year), year_length(year)
+            full = (1 << days) - 1
+            weekend = full & ~weekmask_bits(iso_weekday(first), days, self.weekmask)
+            holiday = interval_bits(self.holidays.intervals, self.holidays.starts, first, first + days - 1)
+            for ordinal in self.holidays.rule_days(year):
+                holiday |= 1 << (ordinal - first)
+            masks = (full & ~combine_off(self.operator, weekend, holiday), holiday)
+            self.masks[year] = masks
+        return masks
+
+    def in_range(self, day: dti.date) -> bool:
+        """Return if the day is within the year range of the configuration (as applied in strict mode)."""
+        if self.first_year is None or self.last_year is None:
+            return False
+        return self.first_year <= day.year < self.last_year
+
+    def is_holiday(self, day: dti.date) -> bool:
+        """Return if the day is a configured holiday."""
+        return bool(self.year_masks(day.year)[1] >> (day.toordinal() - year_start(day.year)) & 1)
+
+    def is_weekend(self, day: dti.date) -> bool:
+        """Return if the day is a weekend day per the weekmask."""
+        return not self.weekmask >> (day.isoweekday() - 1) & 1
+
+    def is_workday(self, day: dti.date) -> bool:
+        """Return if the day is a workday."""
+        return bool(self.year_masks(day.year)[0] >> (day.toordinal() - year_start(day.year)) & 1)
+
+    def is_work_hour(self, hour: int) -> bool:
+        """Return if the hour of day is within the working hours (disregarding the shifts per weekday)."""
+        return self.hours[0] <= hour <= self.hours[1]
+
+    def is_work_minute(self, day: dti.date, minute: int) -> bool:
+        """Return if the minute of the day (0 to 1439) is work time."""
+        return bool(self.minute_masks[day.isoweekday() - 1] >> minute & 1) and self.is_workday(day)
+
+    def is_work_time(self, moment: dti.datetime) -> bool:
+        """Return if the moment is work time."""
+        return self.is_work_minute(moment.date(), moment.hour * 60 + moment.minute)
+
+    def next_workday(self, day: dti.date) -> dti.date:
+        """Return the day itself if a workday or else the next workday."""
+        year, offset = day.year, day.toordinal() - year_start(day.year)
+        while year <= dti.MAXYEAR:
+            bits = self.year_masks(year)[0] >> offset
+            if bits:
+                return dti.date.fromordinal(year_start(year) + offset + lowest_bit(bits))
+            year, offset = year + 1, 0
+        raise ValueError(f'no workday on or after ({day})')
+
+    def previous_workday(self, day: dti.date) -> dti.date:
+        """Return the day itself if a workday or else the previous workday."""
+        year, offset = day.year, day.toordinal() - year_start(day.year)
+        while year >= dti.MINYEAR:
+            bits = self.year_masks(year)[0] & ((2 << offset) - 1)
+            if bits:
+                return dti.date.fromordinal(year_start(year) + bits.bit_length() - 1)
+            year -= 1
+            offset = year_length(year) - 1 if year >= dti.MINYEAR else 0
+        raise ValueError(f'no workday on or before ({day})')
+
+    def next_off_day(self, day: dti.date) -> dti.date:
+        """Return the day itself if no workday or else the next weekend day or holiday."""
+        year, offset = day.year, day.toordinal() - year_start(day.year)
+        while year <= dti.MAXYEAR:
+            bits = (((1 << year_length(year)) - 1) & ~self.year_masks(year)[0]) >> offset
+            if bits:
+                return dti.date.fromordinal(year_start(year) + offset + lowest_bit(bits))
+            year, offset = year + 1, 0
+        raise ValueError(f'no off day on or after ({day})')
+
+    def workday_after(self, day: dti.date, count: int) -> dti.date:
+        """Return the count-th (counting from 1) workday after the day."""
+        year, offset = day.year, day.toordinal() - year_start(day.year) + 1
+        while year <= dti.MAXYEAR:
+            bits = self.year_masks(year)[0] >> offset
+            available = popcount(bits)
+            if count <= available:
+                return dti.date.fromordinal(year_start(year) + offset + nth_bit(bits, count))
+            count -= available
+            year, offset = year + 1, 0
+        raise ValueError(f'no {count} workdays after ({day})')
+
+    def workday_before(self, day: dti.date, count: int) -> dti.date:
+        """Return the count-th (counting from 1) workday before the day."""
+        year, offset = day.year, day.toordinal() - year_start(day.year)
+        while year >= dti.MINYEAR:
+            bits = self.year_masks(year)[0] & ((1 << offset) - 1)
+            available = popcount(bits)
+            if count <= available:
+                return dti.date.fromordinal(year_start(year) + nth_bit(bits, available - count + 1))
+            count -= available
+            year -= 1
+            offset = year_length(year) if year >= dti.MINYEAR else 0
+        raise ValueError(f'no {count} workdays before ({day})')
+
+    def next_work_time(self, moment: dti.datetime) -> dti.datetime:
+        """Return the moment itself if work time or else the start of the next shift."""
+        if self.is_work_time(moment):
+            return moment
+        day, minute = moment.date(), moment.hour * 60 + moment.minute
+        if self.is_workday(day):
+            for start, _ in self.shifts[day.isoweekday() - 1]:
+                if start > minute:
+                    return day_minute(day, start, moment.tzinfo)
+        day = self.next_workday(day + dti.timedelta(days=1))
+        return day_minute(day, self.shifts[day.isoweekday() - 1][0][0], moment.tzinfo)
+
+    def next_off_time(self, moment: dti.datetime) -> dti.datetime:
+        """Return the moment itself if no work time or else the end of the current shift."""
+        if not self.is_work_time(moment):
+            return moment
+        day, minute = moment.date(), moment.hour * 60 + moment.minute
+        end = next(end for start, end in self.shifts[day.isoweekday() - 1] if start <= minute < end)
+        if end < MINUTES_PER_DAY:
+            return day_minute(day, end, moment.tzinfo)
+        if all(shifts == ((0, MINUTES_PER_DAY),) for shifts in self.shifts):
+            return day_minute(self.next_off_day(day + dti.timedelta(days=1)), 0, moment.tzinfo)
+        while True:  # some weekday is not worked around the clock so this ends within a week
+            day += dti.timedelta(days=1)
+            start, end = self.shifts[day.isoweekday() - 1][0]
+            if not self.is_workday(day) or start > 0:
+                return day_minute(day, 0, moment.tzinfo)
+            if end < MINUTES_PER_DAY:
+                return day_minute(day, end, moment.tzinfo)
+
+    def next_transition(self, moment: dti.datetime) -> dti.datetime:
+        """Return the next instant after moment where work time starts or ends."""
+        if self.is_work_time(moment):
+            return self.next_off_time(moment)
+        return self.next_work_time(moment)
+
+    def range_bits(self, year: int, first: dti.date, last: dti.date) -> int:
+        """Return the bitset of workdays of the year clipped to the closed date interval."""
+        bits = self.year_masks(year)[0]
+        if year == last.year:
+            bits &= (2 << (last.toordinal() - year_start(year))) - 1
+        if year == first.year:
+            bits &= ~((1 << (first.toordinal() - year_start(year))) - 1)
+        return bits
+
+    def workday_count(self, first: dti.date, last: dti.date) -> int:
+        """Return the count of workdays within the closed date interval (one population count per year)."""
+        if last < first:
+            return 0
+        return sum(popcount(self.range_bits(year, first, last)) for year in range(first.year, last.year + 1))
+
+    def work_minutes_count(self, first: dti.date, last: dti.date) -> int:
+        """Return the minutes of work time within the closed date interval (population counts per year and weekday)."""
+        if last < first:
+            return 0
+        if len(set(self.shift_minutes)) == 1:
+            return self.workday_count(first, last) * self.shift_minutes[0]
+        minutes = 0
+        for year in range(first.year, last.year + 1):
+            bits, first_weekday, days = (
+                self.range_bits(year, first, last),
+                iso_weekday(year_start(year)),
+                year_length(year),
+            )
+            for weekday, shift_minutes in enumerate(self.shift_minutes):
+                minutes += shift_minutes * popcount(bits & weekmask_bits(first_weekday, days, 1 << weekday))
+        return minutes
+
+    def window(self, day: dti.date, tzinfo: Union[dti.tzinfo, None] = None) -> tuple[dti.datetime, dti.datetime]:
+        """Return the start of the first and the (exclusive) end of the last shift on the day."""
+        shifts = self.shifts[day.isoweekday() - 1]
+        return day_minute(day, shifts[0][0], tzinfo), day_minute(day, shifts[-1][1], tzinfo)
+
+    def windows(self, day: dti.date, tzinfo: Union[dti.tzinfo, None] = None) -> list[tuple[dti.datetime, dti.datetime]]:
+        """Return the start and (exclusive) end of every shift on the day."""
+        return [
+            (day_minute(day, start, tzinfo), day_minute(day, end, tzinfo))
+            for start, end in self.shifts[day.isoweekday() - 1]
+        ]
+
+    def work_time_between(self, first: dti.datetime, last: dti.datetime) -> dti.timedelta:
+        """Return the work time from first to last (negative if last is before first)."""
+        if last < first:
+            return -self.work_time_between(last, first)
+        zero = dti.timedelta(0)
+        first_day, last_day = first.date(), last.date()
+        if first_day == last_day:
+            if not self.is_workday(first_day):
+                return zero
+            return sum(
+                (max(zero, min(last, end) - max(first, start)) for start, end in self.windows(first_day, first.tzinfo)),
+                zero,
+            )
+
+        total = zero
+        if self.is_workday(first_day):
+            total += sum(
+                (max(zero, end - max(first, start)) for start, end in self.windows(first_day, first.tzinfo)), zero
+            )
+        if self.is_workday(last_day):
+            total += sum(
+                (max(zero, min(last, end) - start) for start, end in self.windows(last_day, last.tzinfo)), zero
+            )
+        between = self.work_minutes_count(first_day + dti.timedelta(days=1), last_day - dti.timedelta(days=1))
+        return total + dti.timedelta(minutes=between)
+
+    def add_work_time(self, moment: dti.datetime, duration: dti.timedelta) -> dti.datetime:
+        """Return the instant when the work time duration counted from moment is spent."""
+        if duration < dti.timedelta(0):
+            raise ValueError('duration of work time must not be negative')
+        if not duration:
+            return moment
+        day = moment.date()
+        if self.is_workday(day):
+            for start, end in self.windows(day, moment.tzinfo):
+                begin = max(moment, start)
+                if begin < end:
+                    if duration <= end - begin:
+                        return begin + duration
+                    duration -= end - begin
+
+        if len(set(self.shift_minutes)) == 1:
+            days, rest = divmod(duration, dti.timedelta(minutes=self.shift_minutes[0]))
+            if not rest:
+                days, rest = days - 1, dti.timedelta(minutes=self.shift_minutes[0])
+            day = self.workday_after(day, days + 1)
+        else:
+            rest = duration
+            while day.year < dti.MAXYEAR:  # skip whole years before walking the workdays of the final one
+                remaining = dti.timedelta(
+                    minutes=self.work_minutes_count(day + dti.timedelta(days=1), dti.date(day.year, 12, 31))
+                )
+                if rest <= remaining:
+                    break
+                rest -= remaining
+                day = dti.date(day.year, 12, 31)
+            while True:
+                day = self.workday_after(day, 1)
+                available = dti.timedelta(minutes=self.shift_minutes[day.isoweekday() - 1])
+                if rest <= available:
+                    break
+                rest -= available
+
+        for start, end in self.windows(day, moment.tzinfo):
+            if rest <= end - start:
+                return start + rest
+            rest -= end - start
+        raise AssertionError('work time left after the last shift of the day')  # pragma: no cover
+
+    def workdays(self, year: int) -> list[dti.date]:
+        """Return all workdays of the year."""
+        first, bits = year_start(year), self.year_masks(year)[0]
+        return [dti.date.fromordinal(first + n) for n in range(bits.bit_length()) if bits >> n & 1]
+
+    def busday_roll(self, day: dti.date, roll: str = ROLL_FORWARD[0]) -> dti.date:
+        """Return the day if a workday or else roll it per mode (the modes follow numpy.busday_offset)."""
+        if roll not in ROLL_MODES:
+            raise ValueError(f'unknown roll mode ({roll})')
+        if self.is_workday(day):
+            return day
+        if roll == ROLL_RAISE:
+            raise ValueError(f'day ({day}) is no workday')
+        if roll in ROLL_FORWARD:
+            return self.next_workday(day)
+        if roll in ROLL_BACKWARD:
+            return self.previous_workday(day)
+        following, preceding = self.next_workday(day), self.previous_workday(day)
+        if roll == ROLL_MODIFIED_FORWARD:
+            return following if following.month == day.month else preceding
+        return preceding if preceding.month == day.month else following
+
+    def busday_offset(self, day: dti.date, offset: int, roll: str = ROLL_RAISE) -> dti.date:
+        """Return the workday offset workdays from the day rolled to a workday first (like numpy.busday_offset)."""
+        rolled = self.busday_roll(day, roll)
+        if offset > 0:
+            return self.workday_after(rolled, offset)
+        if offset < 0:
+            return self.workday_before(rolled, -offset)
+        return rolled
+
+    def busday_count(self, begin: dti.date, end: dti.date) -> int:
+        """Return the count of workdays within [begin, end) or the negated count within (end, begin]."""
+        if end < begin:
+            return -self.workday_count(end + dti.timedelta(days=1), begin)
+        return self.workday_count(begin, end - dti.timedelta(days=1))
+
+    def work_time_count(self, first: dti.date, last: dti.date) -> int:
+        """Return the count of full working hours within the closed date interval."""
+        return self.work_minutes_count(first, last) // 60
+
+    def explain(
+        self, day: dti.date, hour: Union[int, None] = None, strict: bool = False, minute: Union[int, None] = None
+    ) -> Tuple[int, str, list[str]]:
+        """Apply the effective rules to day and hour (if given) and return code, message, and explaining notes.
+
+        The minute within the hour (default 0) only matters for shifts not starting or ending on full hours.
+        """
+        notes: list[str] = []
+        if strict:
+            if not self.holidays:
+                return 2, '- empty date range of configuration', notes
+            if not self.in_range(day):
+                return 2, '- Day is not within year range of configuration', notes
+            notes.append(f'- Day ({day}) is within date range of configuration')
+
+        holiday, workday = self.is_holiday(day), self.is_workday(day)
+        if holiday and not workday:
+            return 1, '- Day is a holiday.', notes
+        if holiday:
+            notes.append(f'- Day ({day}) is a holiday but a workday per operator ({self.operator})')
+        else:
+            notes.append(f'- Day ({day}) is not a holiday')
+
+        if not workday:
+            return 1, '- Day is weekend.', notes
+        if self.is_weekend(day):
+            notes.append(f'- Day ({day}) is a weekend day but a workday per operator ({self.operator})')
+        else:
+            notes.append(f'- Day ({day}) is not a weekend')
+
+        if hour is not None:
+            when = f'{hour:02d}:{minute:02d}' if minute else f'{hour}'
+            if not self.minute_masks[day.isoweekday() - 1] >> (hour * 60 + (minute or 0)) & 1:
+                return 1, f'- No worktime at hour({when}).', notes
+            notes.append(f'- At this hour ({when}) is work time')
+
+        return 0, '', notes
+
+    def check(
+        self, day: dti.date, hour: Union[int, None] = None, strict: bool = False, minute: Union[int, None] = None
+    ) -> Tuple[int, str]:
+        """Apply the effective rules to day and hour (if given) and return code and message."""
+        code, message, _ = self.explain(day, hour, strict, minute)
+        return code, message
+
+
 @no_type_check
 def days_of_year(day=None) -> list[dti.date]:
     """Return all days of the year that contains the day."""
@@ -70,7 +958,8 @@ def workdays(off_days: list[dti.date], days=None) -> list[dti.date]:
     """Return all workdays of the year that contains the day."""
     if days is None:
         days = days_of_year(None)
-    return [cand for cand in days if cand not in off_days and no_weekend(weekday(cand))]
+    calendar = Calendar(off_days)
+    return [cand for cand in days if calendar.is_workday(cand)]
 
 
 @no_type_check
@@ -80,149 +969,133 @@ def workdays_of_month(work_days, month) -> list[dti.date]:
 
 
 @no_type_check
-def workdays_count_per_month(work_days) -> dict[str, int]:
-    """Return the workday count per month of the year that contains the day."""
-    per = {}
-    for work_day in work_days:
-        month = year_month_me(work_day)
-        if month not in per:
-            per[month] = 0
-        per[month] += 1
-    return per
+def workdays_count_per_month(work_days, years=None) -> dict[str, int]:
+    """Return the workday count per month of the workdays (optionally only for the container of years)."""
+    if isinstance(work_days, WorkdayIndex):
+        per = work_days.months if years is None else month_counts(work_days.days, years)
+    else:
+        per = month_counts(work_days, years)
+    return {year_month_label(key): count for key, count in per.items()}
 
 
 @no_type_check
-def cumulative_workdays_count_per_month(work_days) -> dict[str, int]:
-    """Return the cumulative workday count per month of the year that contains the day."""
-    per = workdays_count_per_month(work_days)
-    months = list(per)
-    cum = copy.deepcopy(per)
-    for slot, month in enumerate(months, start=1):
-        cum[month] = sum(per[m] for m in months[:slot])
-    return cum
+def cumulative_workdays_count_per_month(work_days, years=None) -> dict[str, int]:
+    """Return the cumulative workday count per month of the workdays (optionally only for the container of years).
+
+    Example for a multi-year span: cumulative_workdays_count_per_month(work_days, years=range(1995, 2025))
+    """
+    if isinstance(work_days, WorkdayIndex) and years is None:
+        cum = work_days.cumulative_months
+    else:
+        cum = running_totals(month_counts(work_days.days if isinstance(work_days, WorkdayIndex) else work_days, years))
+    return {year_month_label(key): count for key, count in cum.items()}
 
 
 @no_type_check
 def workdays_count_of_month_in_between(work_days, month, day, first_month, last_month) -> int:
     """Return the workday count of month to date for day (incl.) given first and last month."""
-    per = workdays_count_per_month(work_days)
-    if month not in per or month < first_month or month > last_month:
+    index = workday_index(work_days)
+    key = month_key(month)
+    if key not in index.months or month < first_month or month > last_month:
         return 0
 
-    wds = workdays_of_month(work_days, month)
-    return sum(1 for d in wds if d.day <= day)
+    return index.count_between(month_first_ordinal(key), month_day_ordinal(key, day))
 
 
 @no_type_check
 def closed_interval_months(work_days) -> tuple[str, str]:
     """DRY."""
+    if isinstance(work_days, WorkdayIndex):
+        work_days = work_days.days
     return year_month_me(work_days[0]), year_month_me(work_days[-1])
 
 
 @no_type_check
-def workdays_count_of_year_in_between(work_days, month, day, first_month=None, last_month=None) -> int:
-    """Return the workday count of year to date for day (incl.) given first and last month."""
-    per = workdays_count_per_month(work_days)
+def month_frame(index, month, first_month, last_month) -> Union[tuple[tuple[int, int], ...], None]:
+    """Return the keys of month, first, and last month (defaulting to the index frame) or None if not indexed."""
+    key, first, last = (month_key(m) if m else None for m in (month, first_month, last_month))
     if any(
         (
-            month not in per,
-            first_month and first_month not in per,
-            last_month and last_month not in per,
+            key not in index.months,
+            first_month and first not in index.months,
+            last_month and last not in index.months,
         )
     ):
-        return 0
+        return None
 
-    initial, final = closed_interval_months(work_days)
-    if first_month is None:
-        first_month = initial
-    if last_month is None:
-        last_month = final
+    initial, final = (index.days[0].year, index.days[0].month), (index.days[-1].year, index.days[-1].month)
+    return key, first if first_month else initial, last if last_month else final
 
-    count = 0
-    for d in work_days:
-        ds = year_month_me(d)
-        if first_month <= ds <= last_month:
-            if ds < month or ds == month and d.day <= day:
-                count += 1
 
-    return count
+@no_type_check
+def workdays_count_of_year_in_between(work_days, month, day, first_month=None, last_month=None) -> int:
+    """Return the workday count of year to date for day (incl.) given first and last month."""
+    index = workday_index(work_days)
+    frame = month_frame(index, month, first_month, last_month)
+    if frame is None:
+        return 0
+
+    key, first, last = frame
+    upper = min(month_day_ordinal(key, day), month_last_ordinal(last))
+    return index.count_between(month_first_ordinal(first), upper)
 
 
 @no_type_check
 def remaining_workdays_count_of_year_in_between(work_days, month, day, first_month=None, last_month=None) -> int:
     """Return the workday count of year from date for day (incl.) given first and last month."""
-    per = workdays_count_per_month(work_days)
-    if any(
-        (
-            month not in per,
-            first_month and first_month not in per,
-            last_month and last_month not in per,
-        )
-    ):
+    index = workday_index(work_days)
+    frame = month_frame(index, month, first_month, last_month)
+    if frame is None:
         return 0
 
-    initial, final = closed_interval_months(work_days)
-    if first_month is None:
-        first_month = initial
-    if last_month is None:
-        last_month = final
-
-    count = 0
-    for d in work_days:
-        ds = year_month_me(d)
-        if first_month <= ds <= last_month:
-            if ds == month and d.day > day or ds > month:
-                count += 1
-
-    return count
+    key, first, last = frame
+    lower = max(month_day_ordinal(key, day) + 1, month_first_ordinal(first))
+    return index.count_between(lower, month_last_ordinal(last))
 
 
 @no_type_check
-def workday(off_days: list[dti.date], cmd: str, date: str = '', strict: bool = False) -> Tuple[int, str]:
-    """Apply the effective rules to the given date (default today)."""
-    day = dti.datetime.strptime(date, DATE_FMT).date() if date else dti.date.today()
-    if strict:
-        if not off_days:
-            return 2, '- empty date range of configuration'
-        if not (off_days[0].year <= day.year < off_days[-1].year):
-            return 2, '- Day is not within year range of configuration'
-        else:
-            if cmd.startswith('explain'):
-                print(f'- Day ({day}) is within date range of configuration')
+def parse_day(date: Union[str, dti.date] = '') -> dti.date:
+    """Return the date given as object or in DATE_FMT (default today)."""
+    if isinstance(date, dti.date):
+        return date
+    return dti.datetime.strptime(date, DATE_FMT).date() if date else the_day()
 
-    if day not in off_days:
-        if cmd.startswith('explain'):
-            print(f'- Day ({day}) is not a holiday')
-    else:
-        return 1, '- Day is a holiday.'
 
-    work_day = no_weekend(weekday(day))
-    if work_day:
-        if cmd.startswith('explain'):
-            print(f'- Day ({day}) is not a weekend')
-    else:
-        return 1, '- Day is weekend.'
+@no_type_check
+def workday(
+    off_days: list[dti.date], cmd: str, date: Union[str, dti.date] = '', strict: bool = False
+) -> Tuple[int, str]:
+    """Apply the effective rules to the given date (default today) printing the explanation for explain commands.
 
-    return 0, ''
+    Prefer Calendar.check or Calendar.explain for evaluations without side effects.
+    """
+    code, message, notes = Calendar(off_days).explain(parse_day(date), strict=strict)
+    if cmd.startswith('explain'):
+        for note in notes:
+            print(note)
+    return code, message
 
 
 @no_type_check
 def apply(
-    off_days: list[dti.date], working_hours: WorkingHoursType, cmd: str, day: str, strict: bool
+    off_days: list[dti.date],
+    working_hours: WorkingHoursType,
+    cmd: str,
+    day: Union[str, dti.date],
+    strict: bool,
+    hour: Union[int, None] = None,
 ) -> Tuple[int, str]:
-    """Apply the effective rules to the current date and time."""
-    working_hours = working_hours if working_hours != (None, None) else DEFAULT_WORK_HOURS_CLOSED_INTERVAL
-    code, message = workday(off_days, cmd, date=str(day), strict=strict)
-    if code:
-        return code, message
-    hour = the_hour()
-    if working_hours[0] <= hour <= working_hours[1]:
-        if cmd.startswith('explain'):
-            print(f'- At this hour ({hour}) is work time')
-    else:
-        return 1, f'- No worktime at hour({hour}).'
+    """Apply the effective rules to the date and hour (default the current date and time).
 
-    return 0, ''
+    The explanation is printed for explain commands - prefer Calendar.check or Calendar.explain to avoid that.
+    """
+    day = parse_day(day if isinstance(day, dti.date) else str(day))
+    hour, minute = (the_hour(), the_minute()) if hour is None else (hour, None)
+    code, message, notes = Calendar(off_days, working_hours).explain(day, hour, strict, minute)
+    if cmd.startswith('explain'):
+        for note in notes:
+            print(note)
+    return code, message
 
 
 @no_type_check
@@ -234,34 +1107,128 @@ def load(cfg: CfgType) -> Tuple[int, str, list[dti.date], WorkingHoursType]:
     if not cfg:
         return 0, 'empty configuration, using default', [], DEFAULT_WORK_HOURS_MARKER
 
+    if TRACE:
+        started = TRACE.start()
+    from pydantic import ValidationError  # Deferred as validation is not needed given a compiled cache
+
+    import arbejdstimer.api as api
+
+    if TRACE:
+        TRACE.stop('import_models', started)
+        started = TRACE.start()
     try:
         model = api.Arbejdstimer(**cfg)
     except ValidationError as err:
         return 2, str(err), [], (None, None)
-
-    holidays_date_list = []
+    finally:
+        if TRACE:
+            TRACE.stop('validate', started)
+
+    if TRACE:
+        started = TRACE.start()
+    holiday_intervals, rules = [], []
+    dump = model.model_dump()
     if model.holidays:
-        holidays = model.model_dump()['holidays']
-        for nth, holiday in enumerate(holidays, start=1):
-            dates = holiday['at']
-            if len(dates) == 1:
-                holidays_date_list.append(dates[0])
-            elif len(dates) == 2:
-                data = sorted(dates)
-                start, end = [data[n] for n in (0, 1)]
-                current = start
-                holidays_date_list.append(current)
-                while current < end:
-                    current += dti.timedelta(days=1)
-                    holidays_date_list.append(current)
+        for holiday in dump['holidays']:
+            ordinals = sorted(a_date.toordinal() for a_date in holiday['at'])
+            if len(ordinals) == 2:
+                holiday_intervals.append((ordinals[0], ordinals[1]))
             else:
-                for a_date in dates:
-                    holidays_date_list.append(a_date)
+                holiday_intervals.extend((ordinal, ordinal) for ordinal in ordinals)
 
     working_hours = DEFAULT_WORK_HOURS_MARKER
     if model.working_hours:
         working_hours = tuple(sorted(model.working_hours.model_dump()))
-    return 0, '', sorted(holidays_date_list), working_hours
+    if model.holiday_rules:
+        rules = [rule_of(holiday_rule) for holiday_rule in dump['holiday_rules']]
+    weekmask = parse_weekmask(model.weekmask.root) if model.weekmask else DEFAULT_WEEKMASK
+    shifts: list[list[tuple[int, int]]] = [[] for _ in range(7)]
+    if model.shifts:
+        for shift in dump['shifts']:
+            intervals = [(parse_clock(start), parse_clock(end)) for start, end in shift['at']]
+            for iso_weekday_number in shift['weekdays']:
+                shifts[iso_weekday_number - 1].extend(intervals)
+    holidays = OffDays(
+        intervals=holiday_intervals,
+        operator=model.operator.value,
+        rules=rules,
+        weekmask=weekmask,
+        shifts=shifts,
+    )
+    if TRACE:
+        TRACE.stop('expand', started)
+        TRACE.count('holiday_entries', len(cfg.get('holidays', [])))
+        TRACE.count('holiday_intervals', len(holidays.intervals))
+        TRACE.count('holiday_days', len(holidays))
+        TRACE.count('holiday_rules', len(holidays.rules))
+    return 0, '', holidays, working_hours
+
+
+@no_type_check
+def spec_of(holidays) -> dict[str, object]:
+    """Return the specification of the holidays besides the intervals (for the compiled cache)."""
+    if not isinstance(holidays, OffDays):
+        return {}
+    spec = {'operator': holidays.operator}
+    if holidays.rules:
+        spec['rules'] = [list(rule) for rule in holidays.rules]
+    if holidays.weekmask != DEFAULT_WEEKMASK:
+        spec['weekmask'] = holidays.weekmask
+    if holidays.shifts:
+        spec['shifts'] = [[list(shift) for shift in day] for day in holidays.shifts]
+    return spec
+
+
+@no_type_check
+def off_days_from_spec(intervals, spec) -> OffDays:
+    """Return the holidays from the intervals and the specification (from the compiled cache)."""
+    return OffDays(
+        intervals=intervals,
+        operator=spec.get('operator', OPERATOR_OR),
+        rules=spec.get('rules', ()),
+        weekmask=spec.get('weekmask', DEFAULT_WEEKMASK),
+        shifts=spec.get('shifts', ()),
+    )
+
+
+@no_type_check
+def load_path(config, verbatim: bool = False):
+    """Load the configuration file (per compiled cache if enabled and not verbatim).
+
+    Return error, message, holidays, working hours, and the parsed configuration (None if taken from the cache).
+    """
+    configuration, compiled, key = None, None, None
+    folder = cache.cache_dir()
+    if folder:
+        if TRACE:
+            started = TRACE.start()
+        try:
+            key = cache.cache_key(config)
+        except OSError:
+            folder = None
+        else:
+            compiled = cache.read(key, folder) if not verbatim else None
+        if TRACE:
+            TRACE.stop('cache_read', started)
+            TRACE.count('cache_hits' if compiled else 'cache_misses')
+
+    if compiled:
+        intervals, working_hours, spec = compiled
+        return 0, '', off_days_from_spec(intervals, spec), working_hours, configuration
+
+    if TRACE:
+        started = TRACE.start()
+    configuration = load_config(config)
+    if TRACE:
+        TRACE.stop('load_config', started)
+    error, message, holidays, working_hours = load(configuration)
+    if folder and not error:
+        if TRACE:
+            started = TRACE.start()
+        cache.write(key, folder, holidays.intervals if holidays else [], working_hours, spec_of(holidays))
+        if TRACE:
+            TRACE.stop('cache_write', started)
+    return error, message, holidays, working_hours, configuration
 
 
 @no_type_check
@@ -294,6 +1261,101 @@ def verify_request(argv: Union[CmdType, None]) -> Tuple[int, str, CmdType]:
     return 0, '', argv
 
 
+@no_type_check
+def parse_moment(moment: Union[str, dti.datetime] = '') -> dti.datetime:
+    """Return the date time given as object or in ISO format (default now)."""
+    if isinstance(moment, dti.datetime):
+        return moment
+    return dti.datetime.fromisoformat(moment) if moment else the_moment()
+
+
+def load_calendar(config: str) -> Tuple[int, Union[Calendar, None]]:
+    """Verify and load the configuration into a calendar (problems are reported on standard error)."""
+    error, message, _ = verify_request(('now', '', config, False))
+    if error:
+        print(message, file=sys.stderr)
+        return error, None
+
+    error, message, holidays, working_hours, _ = load_path(config)
+    if error:
+        print('Configuration file failed to parse (INVALID)', file=sys.stderr)
+        print(message, file=sys.stderr)
+        return int(error), None
+
+    return 0, Calendar(holidays, working_hours)
+
+
+def parse_duration(duration: str) -> dti.timedelta:
+    """Return the duration given as hours (decimal) or hours and minutes (H:MM)."""
+    hours, colon, minutes = duration.strip().partition(':')
+    if colon:
+        if not hours.isdigit() or not minutes.isdigit() or int(minutes) > 59:
+            raise ValueError(f'invalid duration ({duration})')
+        return dti.timedelta(hours=int(hours), minutes=int(minutes))
+    return dti.timedelta(hours=float(hours))
+
+
+def format_duration(duration: dti.timedelta) -> str:
+    """Return the duration as hours and minutes (H:MM) with seconds truncated."""
+    sign = '-' if duration < dti.timedelta(0) else ''
+    minutes = int(abs(duration).total_seconds()) // 60
+    return f'{sign}{minutes // 60}:{minutes % 60:02d}'
+
+
+def main_between(config: str, first: str, last: str) -> int:
+    """Print the work time (H:MM) between the date times."""
+    try:
+        start, end = parse_moment(first), parse_moment(last)
+    except ValueError:
+        print(f'received invalid date time ({first} or {last})', file=sys.stderr)
+        return 2
+    if (start.tzinfo is None) != (end.tzinfo is None):
+        print('received date times with and without time zone', file=sys.stderr)
+        return 2
+
+    error, calendar = load_calendar(config)
+    if error or calendar is None:
+        return error
+
+    print(format_duration(calendar.work_time_between(start, end)))
+    return 0
+
+
+def main_add(config: str, moment: str, duration: str) -> int:
+    """Print the instant when the work time duration counted from the date time (default now) is spent."""
+    try:
+        start, spent = parse_moment(moment), parse_duration(duration)
+    except ValueError:
+        print(f'received invalid date time ({moment}) or duration ({duration})', file=sys.stderr)
+        return 2
+    if spent < dti.timedelta(0):
+        print(f'received negative duration ({duration})', file=sys.stderr)
+        return 2
+
+    error, calendar = load_calendar(config)
+    if error or calendar is None:
+        return error
+
+    print(calendar.add_work_time(start, spent).isoformat())
+    return 0
+
+
+def main_next(config: str, moment: str = '') -> int:
+    """Print the next instant work time starts or ends and return 0 if moment (default now) is work time else 1."""
+    try:
+        start = parse_moment(moment)
+    except ValueError:
+        print(f'received invalid date time ({moment})', file=sys.stderr)
+        return 2
+
+    error, calendar = load_calendar(config)
+    if error or calendar is None:
+        return error
+
+    print(calendar.next_transition(start).isoformat())
+    return 0 if calendar.is_work_time(start) else 1
+
+
 def main(argv: Union[CmdType, None] = None) -> int:
     """Drive the lookup."""
     error, message, strings = verify_request(argv)
@@ -303,8 +1365,7 @@ def main(argv: Union[CmdType, None] = None) -> int:
 
     command, date, config, strict = strings
 
-    configuration = load_config(config)
-    error, message, holidays, working_hours = load(configuration)
+    error, message, holidays, working_hours, configuration = load_path(config, command == 'explain_verbatim')
     if error:
         if command.startswith('explain'):
             print('Configuration file failed to parse (INVALID)')
@@ -342,15 +1403,32 @@ def main(argv: Union[CmdType, None] = None) -> int:
         else:
             effective_range = DEFAULT_WORK_HOURS_CLOSED_INTERVAL
             print(f'  + [{effective_range[0]}, {effective_range[1]}] (application default)')
+        if isinstance(holidays, OffDays) and holidays.weekmask != DEFAULT_WEEKMASK:
+            print('- workdays of the week (Monday first):')
+            print(f'  + {format_weekmask(holidays.weekmask)} (from configuration)')
+        if isinstance(holidays, OffDays) and holidays.shifts:
+            print('- shifts per weekday (replacing the working hours where given):')
+            for name, shifts in zip(WEEKDAY_NAMES, holidays.shifts):
+                if shifts:
+                    print(f'  + {name} ' + ', '.join(f'[{format_clock(a)}, {format_clock(b)})' for a, b in shifts))
         print('evaluation:')
 
     if strict:
         print('detected strict mode (queries outside of year frame from config will fail)')
 
-    error, message = apply(holidays, working_hours, command, date, strict)
+    if TRACE:
+        started = TRACE.start()
+    calendar = Calendar(holidays, working_hours)
+    error, message, notes = calendar.explain(parse_day(date), the_hour(), strict, the_minute())
+    if TRACE:
+        TRACE.stop('evaluate', started)
+        TRACE.count('dates_checked')
+    if command.startswith('explain'):
+        for note in notes:
+            print(note)
     if error:
         if command.startswith('explain'):
             print(message, file=sys.stdout)
-        return error
+        return int(error)
 
     return 0
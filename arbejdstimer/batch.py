@@ -0,0 +1,70 @@
+"""Batch evaluation of ISO dates and date times streamed line by line.
+
+Every non-empty input line yields one output line holding the record, the code, and the reason
+separated by tabs, where the code is 0 for work time, 1 for no work time, and 2 for unusable records.
+Records with a time component are evaluated at their own hour, plain dates only per workday rules.
+"""
+
+import datetime as dti
+import sys
+from collections.abc import Iterable, Iterator
+from typing import TextIO, Tuple, Union
+
+import arbejdstimer.arbejdstimer as at
+
+STDIN_MARKER = '-'
+SEPARATOR = '\t'
+DATE_LENGTH = len('YYYY-MM-DD')
+
+
+def classify(calendar: at.Calendar, record: str, strict: bool = False) -> Tuple[int, str]:
+    """Apply the effective rules to the ISO date or date time record."""
+    try:
+        if len(record) == DATE_LENGTH:
+            return calendar.check(dti.date.fromisoformat(record), None, strict)
+        moment = dti.datetime.fromisoformat(record)
+    except ValueError:
+        return 2, '- Record is no ISO date or date time.'
+
+    return calendar.check(moment.date(), moment.hour, strict, moment.minute)
+
+
+def evaluate(calendar: at.Calendar, lines: Iterable[str], strict: bool = False) -> Iterator[str]:
+    """Lazily yield one result line per non-empty input line."""
+    for line in lines:
+        record = line.strip()
+        if record:
+            code, reason = classify(calendar, record, strict)
+            yield f'{record}{SEPARATOR}{code}{SEPARATOR}{reason}'
+
+
+def stream(calendar: at.Calendar, source: TextIO, strict: bool = False) -> int:
+    """Write the results for the records from source to standard out and return the count of records."""
+    if at.TRACE:
+        started = at.TRACE.start()
+    count = 0
+    for count, result in enumerate(evaluate(calendar, source, strict), start=1):
+        sys.stdout.write(f'{result}\n')
+    if at.TRACE:
+        at.TRACE.stop('evaluate', started)
+        at.TRACE.count('dates_checked', count)
+    return count
+
+
+def batch(config: str, source: Union[str, None] = STDIN_MARKER, strict: bool = False) -> int:
+    """Load the configuration once and classify all records from the source (default standard in)."""
+    error, calendar = at.load_calendar(config)
+    if error or calendar is None:
+        return error
+
+    if not source or source == STDIN_MARKER:
+        stream(calendar, sys.stdin, strict)
+        return 0
+
+    try:
+        with open(source, 'rt', encoding=at.ENCODING, errors=at.ENCODING_ERRORS_POLICY) as handle:
+            stream(calendar, handle, strict)
+    except OSError as err:
+        print(f'input ({source}) not readable: {err}', file=sys.stderr)
+        return 2
+    return 0
@@ -0,0 +1,120 @@
+"""Compiled calendar cache keyed by the configuration path, modification time, and content hash."""
+
+import hashlib
+import json
+import mmap
+import os
+import pathlib
+import struct
+from typing import Union
+
+CACHE_VAR = 'ARBEJDSTIMER_CACHE'
+CACHE_XDG_VALUES = ('1', 'xdg')
+CACHE_SUFFIX = '.atc'
+MAGIC = b'ATCC'
+FORMAT_VERSION = 5
+NO_HOUR = -1
+
+# magic, format version, config mtime (ns), path digest, content digest, working hours, interval count, spec size
+# followed by the intervals and the calendar specification (operator, rules, weekmask, shifts) as JSON object
+HEADER = struct.Struct('<4sHxxq32s32sbbxxII')
+INTERVAL = struct.Struct('<II')
+
+KeyType = tuple[bytes, int, bytes]
+IntervalsType = list[tuple[int, int]]
+HoursType = Union[tuple[int, int], tuple[None, None]]
+SpecType = dict[str, object]
+CompiledType = tuple[IntervalsType, HoursType, SpecType]
+
+
+def cache_dir(setting: Union[str, None] = None) -> Union[pathlib.Path, None]:
+    """Return the cache folder per setting (default from environment) or None if caching is disabled.
+
+    The values 1 and xdg select the arbejdstimer folder below $XDG_CACHE_HOME (default ~/.cache)
+    and any other non-empty value is taken as the path to the cache folder.
+    """
+    setting = os.getenv(CACHE_VAR, '') if setting is None else setting
+    if not setting:
+        return None
+    if setting.lower() in CACHE_XDG_VALUES:
+        xdg_cache_home = os.getenv('XDG_CACHE_HOME', '')
+        base = pathlib.Path(xdg_cache_home) if xdg_cache_home else pathlib.Path.home() / '.cache'
+        return base / 'arbejdstimer'
+    return pathlib.Path(setting)
+
+
+def cache_key(config: Union[str, pathlib.Path]) -> KeyType:
+    """Return the digest of the resolved path, the modification time, and the digest of the config content."""
+    config_path = pathlib.Path(config).resolve()
+    with open(config_path, 'rb') as handle:
+        stat = os.fstat(handle.fileno())
+        content = handle.read()
+    path_digest = hashlib.sha256(str(config_path).encode('utf-8')).digest()
+    return path_digest, stat.st_mtime_ns, hashlib.sha256(content).digest()
+
+
+def cache_path(key: KeyType, folder: pathlib.Path) -> pathlib.Path:
+    """Return the path to the compiled artifact for the config key within the folder."""
+    return folder / f'{key[0].hex()[:32]}{CACHE_SUFFIX}'
+
+
+def dumps(
+    key: KeyType, intervals: IntervalsType, working_hours: HoursType, spec: Union[SpecType, None] = None
+) -> bytes:
+    """Return the compiled artifact as bytes."""
+    hours = (NO_HOUR, NO_HOUR) if working_hours[0] is None else working_hours
+    specification = json.dumps(spec or {}, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, key[1], key[0], key[2], *hours, len(intervals), len(specification))
+    return header + b''.join(INTERVAL.pack(start, end) for start, end in intervals) + specification
+
+
+def loads(buffer: Union[bytes, mmap.mmap], key: KeyType) -> Union[CompiledType, None]:
+    """Return holiday intervals, working hours, and specification from the artifact or None if not matching the key."""
+    if len(buffer) < HEADER.size:
+        return None
+    magic, version, mtime_ns, path_digest, content_digest, start, end, count, size = HEADER.unpack_from(buffer)
+    if (magic, version) != (MAGIC, FORMAT_VERSION) or (path_digest, mtime_ns, content_digest) != key:
+        return None
+    spec_offset = HEADER.size + count * INTERVAL.size
+    if len(buffer) != spec_offset + size:
+        return None
+    intervals = list(INTERVAL.iter_unpack(buffer[HEADER.size : spec_offset]))
+    working_hours: HoursType = (None, None) if start == NO_HOUR else (start, end)
+    try:
+        spec = json.loads(bytes(buffer[spec_offset:]).decode('utf-8'))
+    except ValueError:
+        return None
+    return intervals, working_hours, spec
+
+
+def read(key: KeyType, folder: pathlib.Path) -> Union[CompiledType, None]:
+    """Return holiday intervals, working hours, and specification from the memory mapped artifact or None if stale."""
+    try:
+        with open(cache_path(key, folder), 'rb') as handle:
+            with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return loads(mapped, key)
+    except (OSError, ValueError):
+        return None
+
+
+def write(
+    key: KeyType,
+    folder: pathlib.Path,
+    intervals: IntervalsType,
+    working_hours: HoursType,
+    spec: Union[SpecType, None] = None,
+) -> bool:
+    """Write the compiled artifact atomically and return if that succeeded.
+
+    The key has to be taken before reading the configuration so a concurrent change cannot be masked.
+    """
+    try:
+        folder.mkdir(parents=True, exist_ok=True)
+        target = cache_path(key, folder)
+        transient = target.with_name(f'{target.name}.{os.getpid()}')
+        with open(transient, 'wb') as handle:
+            handle.write(dumps(key, intervals, working_hours, spec))
+        os.replace(transient, target)
+    except OSError:
+        return False
+    return True
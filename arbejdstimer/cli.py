@@ -149,6 +149,183 @@ def explain(
     return explain_enforce_defaults(conf, day, verbose, strict)
 
 
+@app.command('next')
+def app_next(
+    conf: str = typer.Option(
+        '',
+        '-c',
+        '--config',
+        help='Path to config file (default is $HOME/.arbejdstimer.json)',
+        metavar='<configpath>',
+    ),
+    moment: str = typer.Option(
+        '',
+        '-a',
+        '--at',
+        help='Date time sought in ISO format (default is now)',
+        metavar='<datetime>',
+    ),
+) -> int:
+    """
+    Write the next instant when work time starts or ends
+    (the return code is 0 if at the date time sought is work time, and 1 if not).
+    """
+    config = conf if conf else pathlib.Path.home() / at.DEFAULT_CONFIG_NAME
+    return sys.exit(at.main_next(str(config), moment))
+
+
+@app.command('between')
+def app_between(
+    conf: str = typer.Option(
+        '',
+        '-c',
+        '--config',
+        help='Path to config file (default is $HOME/.arbejdstimer.json)',
+        metavar='<configpath>',
+    ),
+    first: str = typer.Option(
+        ...,
+        '-f',
+        '--from',
+        help='Date time to count from in ISO format',
+        metavar='<datetime>',
+    ),
+    last: str = typer.Option(
+        ...,
+        '-t',
+        '--to',
+        help='Date time to count to in ISO format',
+        metavar='<datetime>',
+    ),
+) -> int:
+    """
+    Write the work time (hours:minutes) between two date times.
+    """
+    config = conf if conf else pathlib.Path.home() / at.DEFAULT_CONFIG_NAME
+    return sys.exit(at.main_between(str(config), first, last))
+
+
+@app.command('add')
+def app_add(
+    conf: str = typer.Option(
+        '',
+        '-c',
+        '--config',
+        help='Path to config file (default is $HOME/.arbejdstimer.json)',
+        metavar='<configpath>',
+    ),
+    moment: str = typer.Option(
+        '',
+        '-a',
+        '--at',
+        help='Date time to count from in ISO format (default is now)',
+        metavar='<datetime>',
+    ),
+    duration: str = typer.Option(
+        ...,
+        '-w',
+        '--work',
+        help='Work time to add as hours (decimal) or hours:minutes',
+        metavar='<duration>',
+    ),
+) -> int:
+    """
+    Write the instant when the given work time counted from the date time is spent.
+    """
+    config = conf if conf else pathlib.Path.home() / at.DEFAULT_CONFIG_NAME
+    return sys.exit(at.main_add(str(config), moment, duration))
+
+
+@app.command('batch')
+def batch(
+    conf: str = typer.Option(
+        '',
+        '-c',
+        '--config',
+        help='Path to config file (default is $HOME/.arbejdstimer.json)',
+        metavar='<configpath>',
+    ),
+    source: str = typer.Option(
+        '-',
+        '-i',
+        '--input',
+        help='Path to file with one ISO date or date time per line (default is - for standard in)',
+        metavar='<inputpath>',
+    ),
+    strict: bool = typer.Option(
+        False,
+        '-s',
+        '--strict',
+        help='Enforce presence of farming dates in configuration (default is false if not provided)',
+        metavar='<bool>',
+    ),
+) -> int:
+    """
+    Stream one line with record, code, and reason (tab separated) per ISO date or date time read.
+    """
+    import arbejdstimer.batch as evaluation
+
+    config = conf if conf else pathlib.Path.home() / at.DEFAULT_CONFIG_NAME
+    return sys.exit(evaluation.batch(str(config), source, strict))
+
+
+@app.command('serve')
+def serve(
+    conf: str = typer.Option(
+        '',
+        '-c',
+        '--config',
+        help='Path to config file (default is $HOME/.arbejdstimer.json)',
+        metavar='<configpath>',
+    ),
+    socket_path: str = typer.Option(
+        '',
+        '--socket',
+        help='Path to the Unix domain socket (default is $ARBEJDSTIMER_SOCKET or within $XDG_RUNTIME_DIR)',
+        metavar='<socketpath>',
+    ),
+) -> int:
+    """
+    Load the configuration once and answer now and explain queries over a local Unix domain socket.
+    """
+    import arbejdstimer.server as server
+
+    config = conf if conf else pathlib.Path.home() / at.DEFAULT_CONFIG_NAME
+    return sys.exit(server.serve(str(config), socket_path))
+
+
+@app.command('ask')
+def ask(
+    query: str = typer.Argument('now', help='Query to send (now or explain)', metavar='<query>'),
+    day: str = typer.Option(
+        '',
+        '-d',
+        '--day',
+        help='Day sought (default is today)',
+        metavar='<date>',
+    ),
+    strict: bool = typer.Option(
+        False,
+        '-s',
+        '--strict',
+        help='Enforce presence of farming dates in configuration (default is false if not provided)',
+        metavar='<bool>',
+    ),
+    socket_path: str = typer.Option(
+        '',
+        '--socket',
+        help='Path to the Unix domain socket (default is $ARBEJDSTIMER_SOCKET or within $XDG_RUNTIME_DIR)',
+        metavar='<socketpath>',
+    ),
+) -> int:
+    """
+    Ask a running arbejdstimer server (same return codes as the now and explain commands).
+    """
+    import arbejdstimer.server as server
+
+    return sys.exit(server.ask(query, day, strict, socket_path))
+
+
 @app.command('version')
 def app_version() -> None:
     """
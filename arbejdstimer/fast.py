@@ -0,0 +1,83 @@
+"""Minimal command line entry point answering now, explain, and ask without importing typer.
+
+Validation (and thus pydantic) is only imported when no matching compiled cache is present.
+All other commands, options, and help requests are handed over to the typer application.
+"""
+
+import pathlib
+import sys
+from typing import Union
+
+import arbejdstimer.arbejdstimer as at
+
+APP_ALIAS = 'arbejdstimer'
+FAST_OPTIONS = {
+    'now': {'-c': 'conf', '--config': 'conf'},
+    'explain': {'-c': 'conf', '--config': 'conf', '-d': 'day', '--day': 'day'},
+    'ask': {'-d': 'day', '--day': 'day', '--socket': 'socket'},
+}
+FAST_FLAGS = {
+    'now': {'-s': 'strict', '--strict': 'strict'},
+    'explain': {'-s': 'strict', '--strict': 'strict', '-v': 'verbose', '--verbose': 'verbose'},
+    'ask': {'-s': 'strict', '--strict': 'strict'},
+}
+FAST_QUERIES = {'ask': ('explain', 'now')}
+
+ValuesType = dict[str, Union[str, bool]]
+
+
+def scan(argv: list[str]) -> Union[ValuesType, None]:
+    """Return the option values if the fast path understands the arguments or None."""
+    if not argv or argv[0] not in FAST_OPTIONS:
+        return None
+    options, flags, queries = FAST_OPTIONS[argv[0]], FAST_FLAGS[argv[0]], FAST_QUERIES.get(argv[0], ())
+    values: ValuesType = {'conf': '', 'day': '', 'socket': '', 'query': '', 'strict': False, 'verbose': False}
+    args = iter(argv[1:])
+    for arg in args:
+        name, _, value = arg.partition('=') if arg.startswith('--') else (arg, '', '')
+        if name in flags and not value:
+            values[flags[name]] = True
+        elif name in options:
+            if not value:
+                value = next(args, '')
+                if not value or value.startswith('-'):
+                    return None
+            values[options[name]] = value
+        elif name in queries and not values['query']:
+            values['query'] = name
+        else:
+            return None
+    return values
+
+
+def parse(argv: list[str]) -> Union[at.CmdType, None]:
+    """Return the action for main if the fast path understands the arguments or None."""
+    values = scan(argv)
+    if values is None or argv[0] not in ('now', 'explain'):
+        return None
+
+    command = argv[0]
+    if values['verbose']:
+        command += '_verbatim'
+    config = values['conf'] if values['conf'] else pathlib.Path.home() / at.DEFAULT_CONFIG_NAME
+    return command, str(values['day']), str(config), bool(values['strict'])
+
+
+def main(argv: Union[list[str], None] = None) -> int:
+    """Answer now, explain, and ask directly and delegate everything else to the full command line application."""
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == 'ask':
+        values = scan(argv)
+        if values is not None:
+            import arbejdstimer.server as server
+
+            query = str(values['query']) if values['query'] else 'now'
+            return server.ask(query, str(values['day']), bool(values['strict']), str(values['socket']))
+
+    action = parse(argv)
+    if action is not None:
+        return at.main(action)
+
+    from arbejdstimer.cli import app
+
+    return app(args=argv, prog_name=APP_ALIAS)  # type: ignore
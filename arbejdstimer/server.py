@@ -0,0 +1,174 @@
+"""Long-running query daemon answering now and explain queries over a local Unix domain socket.
+
+The line protocol is tiny: the client sends one request line
+
+    <command> [<date>] [strict]
+
+with the command being now or explain and the optional date in the format YYYY-MM-DD.
+The daemon replies with zero or more message lines followed by a line holding only the
+exit code (0 for work time, 1 for no work time, and 2 for usage errors) and closes the connection.
+"""
+
+import datetime as dti
+import os
+import pathlib
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+from typing import Tuple, Union
+
+import arbejdstimer.arbejdstimer as at
+
+SOCKET_VAR = 'ARBEJDSTIMER_SOCKET'
+SOCKET_NAME = 'arbejdstimer.sock'
+QUERY_COMMANDS = ('explain', 'now')
+MAX_REQUEST_BYTES = 1024
+TIMEOUT_SECONDS = 5.0
+
+RequestType = Tuple[str, str, bool]
+
+
+def default_socket_path() -> pathlib.Path:
+    """Return the socket path from environment or within $XDG_RUNTIME_DIR (default temporary folder)."""
+    from_env = os.getenv(SOCKET_VAR, '')
+    if from_env:
+        return pathlib.Path(from_env)
+    runtime_dir = os.getenv('XDG_RUNTIME_DIR', '')
+    if runtime_dir:
+        return pathlib.Path(runtime_dir) / SOCKET_NAME
+    return pathlib.Path(tempfile.gettempdir()) / f'{os.getuid()}-{SOCKET_NAME}'
+
+
+def request_line(command: str, day: str = '', strict: bool = False) -> str:
+    """Return the request line for the query."""
+    return ' '.join(part for part in (command, day, 'strict' if strict else '') if part) + '\n'
+
+
+def parse_request(line: str) -> Tuple[int, str, RequestType]:
+    """Parse the request line into command, date, and strict flag."""
+    err = ('', '', False)
+    tokens = line.split()
+    if not tokens or tokens[0] not in QUERY_COMMANDS:
+        return 2, 'received unknown command', err
+
+    command, day, strict = tokens[0], '', False
+    for token in tokens[1:]:
+        if token == 'strict' and not strict:
+            strict = True
+        elif not day:
+            try:
+                dti.datetime.strptime(token, at.DATE_FMT)
+            except ValueError:
+                return 2, f'received invalid date ({token})', err
+            day = token
+        else:
+            return 2, 'received unknown argument', err
+
+    return 0, '', (command, day, strict)
+
+
+class QueryHandler(socketserver.StreamRequestHandler):
+    """Answer a single request line per connection."""
+
+    timeout = TIMEOUT_SECONDS
+
+    def handle(self) -> None:
+        line = self.rfile.readline(MAX_REQUEST_BYTES).decode(at.ENCODING, at.ENCODING_ERRORS_POLICY)
+        code, messages = self.server.answer(line)  # type: ignore
+        reply = ''.join(f'{message}\n' for message in messages) + f'{code}\n'
+        self.wfile.write(reply.encode(at.ENCODING))
+
+
+class QueryServer(socketserver.ThreadingUnixStreamServer):
+    """Keep the indexed calendar in memory and answer queries from it."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Union[str, pathlib.Path], calendar: at.Calendar):
+        self.calendar = calendar
+        super().__init__(str(socket_path), QueryHandler)
+
+    def answer(self, line: str) -> Tuple[int, list[str]]:
+        """Return the exit code and the messages for the request line."""
+        error, message, (command, day, strict) = parse_request(line)
+        if error:
+            return error, [message]
+        if at.TRACE:
+            started = at.TRACE.start()
+        code, message, notes = self.calendar.explain(at.parse_day(day), at.the_hour(), strict, at.the_minute())
+        if at.TRACE:
+            at.TRACE.stop('evaluate', started)
+            at.TRACE.count('dates_checked')
+        return code, (notes if command == 'explain' else []) + ([message] if message else [])
+
+
+def remove_stale_socket(socket_path: pathlib.Path) -> bool:
+    """Remove a left over socket file nobody listens on and return if the path is free."""
+    try:
+        if not stat.S_ISSOCK(socket_path.lstat().st_mode):
+            return False
+    except FileNotFoundError:
+        return True
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(socket_path))
+        except OSError:
+            socket_path.unlink()
+            return True
+    return False
+
+
+def serve(config: str, socket_path: Union[str, pathlib.Path, None] = None) -> int:
+    """Load the configuration once and answer queries until interrupted."""
+    error, calendar = at.load_calendar(config)
+    if error or calendar is None:
+        return error
+
+    socket_path = pathlib.Path(socket_path) if socket_path else default_socket_path()
+    if not remove_stale_socket(socket_path):
+        print(f'socket path ({socket_path}) is in use', file=sys.stderr)
+        return 2
+
+    with QueryServer(socket_path, calendar) as server:
+        print(f'serving queries for ({config}) on ({socket_path})', file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            socket_path.unlink(missing_ok=True)
+
+    return 0
+
+
+def query(
+    command: str, day: str = '', strict: bool = False, socket_path: Union[str, pathlib.Path, None] = None
+) -> Tuple[int, list[str]]:
+    """Send the query to the daemon and return the exit code and messages (connection errors are raised)."""
+    socket_path = pathlib.Path(socket_path) if socket_path else default_socket_path()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(TIMEOUT_SECONDS)
+        client.connect(str(socket_path))
+        client.sendall(request_line(command, day, strict).encode(at.ENCODING))
+        with client.makefile('r', encoding=at.ENCODING, errors=at.ENCODING_ERRORS_POLICY) as replies:
+            lines = replies.read().splitlines()
+
+    if not lines or not lines[-1].isdigit():
+        return 2, ['received incomplete answer from server']
+    return int(lines[-1]), lines[:-1]
+
+
+def ask(command: str, day: str = '', strict: bool = False, socket_path: Union[str, pathlib.Path, None] = None) -> int:
+    """Thin client returning the same exit codes as main (messages are only printed when explaining)."""
+    try:
+        code, messages = query(command, day, strict, socket_path)
+    except OSError as err:
+        print(f'no arbejdstimer server answering at ({socket_path or default_socket_path()}): {err}', file=sys.stderr)
+        return 2
+
+    if command.startswith('explain'):
+        for message in messages:
+            print(message)
+    return code
@@ -0,0 +1,77 @@
+"""Phase timings and counters enabled per ARBEJDSTIMER_DEBUG and reported on standard error at exit.
+
+Any non-empty value (other than 0) enables the trace, the value json selects a single line JSON document.
+When the variable is not set no trace object exists and the instrumented code only tests a module global.
+"""
+
+import atexit
+import json
+import os
+import sys
+import time
+from typing import TextIO, Union
+
+DEBUG_VAR = 'ARBEJDSTIMER_DEBUG'
+DISABLED_VALUES = ('', '0')
+JSON_VALUE = 'json'
+PREFIX = 'arbejdstimer trace:'
+
+
+class Trace:
+    """Accumulate monotonic phase timings (nanoseconds and calls) and counters."""
+
+    __slots__ = ('as_json', 'origin', 'phases', 'counts')
+
+    def __init__(self, as_json: bool = False):
+        self.as_json = as_json
+        self.origin = time.perf_counter_ns()
+        self.phases: dict[str, list[int]] = {}
+        self.counts: dict[str, int] = {}
+
+    @staticmethod
+    def start() -> int:
+        """Return the monotonic clock reading to pass to stop."""
+        return time.perf_counter_ns()
+
+    def stop(self, phase: str, started: int) -> None:
+        """Add the time elapsed since started to the phase."""
+        elapsed = time.perf_counter_ns() - started
+        slot = self.phases.setdefault(phase, [0, 0])
+        slot[0] += elapsed
+        slot[1] += 1
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Add the value to the named counter."""
+        self.counts[name] = self.counts.get(name, 0) + value
+
+    def document(self) -> dict[str, object]:
+        """Return the trace as JSON serializable mapping (times in milliseconds)."""
+        return {
+            'phases': {phase: {'ms': ns / 1e6, 'calls': calls} for phase, (ns, calls) in self.phases.items()},
+            'counts': dict(self.counts),
+            'total_ms': (time.perf_counter_ns() - self.origin) / 1e6,
+        }
+
+    def dump(self, stream: Union[TextIO, None] = None) -> None:
+        """Write the trace to the stream (default standard error)."""
+        stream = sys.stderr if stream is None else stream
+        document = self.document()
+        if self.as_json:
+            stream.write(json.dumps(document) + '\n')
+            return
+        for phase, data in document['phases'].items():  # type: ignore
+            stream.write(f'{PREFIX} phase {phase} {data["ms"]:.3f} ms in {data["calls"]} call(s)\n')
+        for name, value in document['counts'].items():  # type: ignore
+            stream.write(f'{PREFIX} count {name} {value}\n')
+        stream.write(f'{PREFIX} total {document["total_ms"]:.3f} ms\n')
+
+
+def tracer(setting: Union[str, None] = None, at_exit: bool = True) -> Union[Trace, None]:
+    """Return a trace per setting (default from environment) registered to dump at exit or None if disabled."""
+    setting = os.getenv(DEBUG_VAR, '') if setting is None else setting
+    if setting.strip() in DISABLED_VALUES:
+        return None
+    trace = Trace(as_json=setting.strip().lower() == JSON_VALUE)
+    if at_exit:
+        atexit.register(trace.dump)
+    return trace
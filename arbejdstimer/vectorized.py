@@ -0,0 +1,223 @@
+"""Optional NumPy backend classifying whole arrays of days (datetime64[D]) or minutes (datetime64[m]) at once.
+
+The pure Python functions in arbejdstimer.arbejdstimer remain the reference implementation.
+Install the numpy extra (pip install arbejdstimer[numpy]) to use this module.
+"""
+
+import datetime as dti
+from typing import Any, Union
+
+import arbejdstimer.arbejdstimer as at
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore
+
+ArrayType = Any  # numpy.ndarray without requiring numpy for type checking
+EPOCH_ORDINAL = dti.date(1970, 1, 1).toordinal()
+EPOCH_ISO_WEEKDAY = dti.date(1970, 1, 1).isoweekday()
+
+
+def _require_numpy() -> None:
+    """Fail with a hint if numpy is not available."""
+    if np is None:  # pragma: no cover
+        raise ImportError('the vectorized backend requires numpy (pip install arbejdstimer[numpy])')
+
+
+def as_days(days: Any) -> ArrayType:
+    """Return the dates as datetime64[D] array."""
+    _require_numpy()
+    return np.asarray(days, dtype='datetime64[D]')
+
+
+def days_of_year(year: int) -> ArrayType:
+    """Return all days of the year as datetime64[D] array."""
+    _require_numpy()
+    return np.arange(f'{year:04d}-01-01', f'{year + 1:04d}-01-01', dtype='datetime64[D]')
+
+
+def holiday_bounds(holidays: Union[at.OffDays, list[dti.date]]) -> tuple[ArrayType, ArrayType]:
+    """Return the interval starts and ends of the holidays as datetime64[D] arrays."""
+    _require_numpy()
+    intervals = at.holiday_index(holidays).intervals
+    bounds = np.array(intervals, dtype='int64').reshape(-1, 2) - EPOCH_ORDINAL
+    return bounds[:, 0].astype('datetime64[D]'), bounds[:, 1].astype('datetime64[D]')
+
+
+def rule_days(holidays: Union[at.OffDays, list[dti.date]], days: Any) -> ArrayType:
+    """Return the days given by the recurring rules within the years spanned by the days as datetime64[D] array."""
+    days = as_days(days)
+    rules = holidays.rules if isinstance(holidays, at.OffDays) else ()
+    if not rules or not days.size:
+        return np.array([], dtype='datetime64[D]')
+    years = days.astype('datetime64[Y]').astype('int64') + 1970
+    ordinals = [ordinal for year in range(years.min(), years.max() + 1) for ordinal in at.rule_days(rules, year)]
+    return (np.array(ordinals, dtype='int64') - EPOCH_ORDINAL).astype('datetime64[D]')
+
+
+def holiday_mask(holidays: Union[at.OffDays, list[dti.date]], days: Any) -> ArrayType:
+    """Return the boolean mask of days that are holidays (bisection over the interval starts plus rule days)."""
+    days = as_days(days)
+    starts, ends = holiday_bounds(holidays)
+    mask = np.zeros(days.shape, dtype=bool)
+    if starts.size:
+        slot = np.searchsorted(starts, days, side='right') - 1
+        mask = (slot >= 0) & (days <= ends[np.clip(slot, 0, None)])
+    ruled = rule_days(holidays, days)
+    return mask | np.isin(days, ruled) if ruled.size else mask
+
+
+def iso_weekdays(days: Any) -> ArrayType:
+    """Return the ISO weekday numbers (Monday is 1) of the days."""
+    days = as_days(days)
+    return (days.astype('int64') + EPOCH_ISO_WEEKDAY - 1) % 7 + 1
+
+
+def weekend_mask(days: Any, weekmask: int = at.DEFAULT_WEEKMASK) -> ArrayType:
+    """Return the boolean mask of days that are weekend days per weekmask (mirrors no_weekend)."""
+    return (weekmask >> (iso_weekdays(days) - 1)) & 1 == 0
+
+
+def workday_mask(holidays: Union[at.OffDays, list[dti.date]], days: Any) -> ArrayType:
+    """Return the boolean mask of days that are workdays (combining weekend and holidays per operator)."""
+    days = as_days(days)
+    off_days = at.holiday_index(holidays)
+    weekend = weekend_mask(days, off_days.weekmask)
+    return ~at.combine_off(off_days.operator, weekend, holiday_mask(off_days, days))
+
+
+def workdays(holidays: Union[at.OffDays, list[dti.date]], days: Any) -> ArrayType:
+    """Return the workdays of the days as datetime64[D] array (mirrors workdays)."""
+    days = as_days(days)
+    return days[workday_mask(holidays, days)]
+
+
+def workday_count(holidays: Union[at.OffDays, list[dti.date]], days: Any) -> int:
+    """Return the count of workdays within the days."""
+    return int(np.count_nonzero(workday_mask(holidays, days)))
+
+
+def work_time_mask(
+    holidays: Union[at.OffDays, list[dti.date]], working_hours: at.WorkingHoursType, moments: Any
+) -> ArrayType:
+    """Return the boolean mask of moments (datetime64[m] or finer) that are work time (mirrors apply).
+
+    The shifts per weekday are looked up in a table of seven times 1440 minutes.
+    """
+    _require_numpy()
+    table = np.zeros((7, at.MINUTES_PER_DAY), dtype=bool)
+    for weekday, shifts in enumerate(at.effective_shifts(holidays, working_hours)):
+        for start, end in shifts:
+            table[weekday, start:end] = True
+    moments = np.asarray(moments, dtype='datetime64[m]')
+    days = moments.astype('datetime64[D]')
+    minutes = (moments - days).astype('int64')
+    return workday_mask(holidays, days) & table[iso_weekdays(days) - 1, minutes]
+
+
+def work_time_count(
+    holidays: Union[at.OffDays, list[dti.date]], working_hours: at.WorkingHoursType, moments: Any
+) -> int:
+    """Return the count of moments that are work time."""
+    return int(np.count_nonzero(work_time_mask(holidays, working_hours, moments)))
+
+
+def workday_table(calendar: at.Calendar, first_year: int, last_year: int) -> tuple[int, ArrayType]:
+    """Return the first date ordinal and the running workday counts per day of the closed year interval.
+
+    The table is unpacked from the memoized year bitsets of the calendar.
+    """
+    _require_numpy()
+    flags = []
+    for year in range(first_year, last_year + 1):
+        days = at.year_length(year)
+        packed = np.frombuffer(calendar.year_masks(year)[0].to_bytes((days + 7) // 8, 'little'), dtype=np.uint8)
+        flags.append(np.unpackbits(packed, bitorder='little')[:days])
+    return at.year_start(first_year), np.cumsum(np.concatenate(flags), dtype='int64')
+
+
+def _ordinals(days: Any) -> ArrayType:
+    """Return the date ordinals of the days."""
+    return as_days(days).astype('int64') + EPOCH_ORDINAL
+
+
+def _days(ordinals: ArrayType) -> ArrayType:
+    """Return the date ordinals as datetime64[D] array."""
+    return (np.asarray(ordinals, dtype='int64') - EPOCH_ORDINAL).astype('datetime64[D]')
+
+
+def _table_for(calendar: at.Calendar, ordinals: ArrayType, spread: int = 0) -> tuple[int, ArrayType]:
+    """Return the workday table covering the ordinals widened by spread workdays (and a year) in both directions."""
+    lowest = dti.date.fromordinal(int(ordinals.min())).year
+    highest = dti.date.fromordinal(int(ordinals.max())).year
+    margin = 1
+    while True:
+        base, counts = workday_table(calendar, max(lowest - margin, dti.MINYEAR), min(highest + margin, dti.MAXYEAR))
+        slots = ordinals - base
+        enough = counts[slots.min()] - counts[0] >= spread and counts[-1] - counts[slots.max()] >= spread
+        if enough or (lowest - margin <= dti.MINYEAR and highest + margin >= dti.MAXYEAR):
+            return base, counts
+        margin *= 2
+
+
+def _ranks(base: int, counts: ArrayType, ordinals: ArrayType) -> ArrayType:
+    """Return the count of workdays from the table start up to the ordinals (incl.)."""
+    slots = ordinals - base
+    return np.where(slots >= 0, counts[np.clip(slots, 0, None)], 0)
+
+
+def _select(base: int, counts: ArrayType, ranks: ArrayType) -> ArrayType:
+    """Return the ordinals of the workdays with the ranks within the table."""
+    return base + np.searchsorted(counts, ranks, side='left')
+
+
+def busday_roll(calendar: at.Calendar, days: Any, roll: str = at.ROLL_FORWARD[0]) -> ArrayType:
+    """Return the days rolled to workdays per mode (mirrors Calendar.busday_roll)."""
+    if roll not in at.ROLL_MODES:
+        raise ValueError(f'unknown roll mode ({roll})')
+    ordinals = _ordinals(days)
+    if not ordinals.size:
+        return _days(ordinals)
+    base, counts = _table_for(calendar, ordinals, 1)
+    ranks = _ranks(base, counts, ordinals)
+    valid = ranks - _ranks(base, counts, ordinals - 1) == 1
+    if roll == at.ROLL_RAISE:
+        if not np.all(valid):
+            raise ValueError('days contain non workdays')
+        return _days(ordinals)
+    following = _select(base, counts, ranks + 1)
+    preceding = _select(base, counts, ranks)
+    if roll in at.ROLL_FORWARD:
+        rolled = following
+    elif roll in at.ROLL_BACKWARD:
+        rolled = preceding
+    else:
+        month = as_days(days).astype('datetime64[M]')
+        forward = _days(following).astype('datetime64[M]') == month
+        backward = _days(preceding).astype('datetime64[M]') == month
+        if roll == at.ROLL_MODIFIED_FORWARD:
+            rolled = np.where(forward, following, preceding)
+        else:
+            rolled = np.where(backward, preceding, following)
+    return _days(np.where(valid, ordinals, rolled))
+
+
+def busday_offset(calendar: at.Calendar, days: Any, offsets: Any, roll: str = at.ROLL_RAISE) -> ArrayType:
+    """Return the workdays offset workdays from the days rolled to workdays first (mirrors Calendar.busday_offset)."""
+    rolled = _ordinals(busday_roll(calendar, days, roll))
+    offsets = np.asarray(offsets, dtype='int64')
+    if not rolled.size:
+        return _days(rolled)
+    base, counts = _table_for(calendar, rolled, int(np.abs(offsets).max(initial=0)))
+    return _days(_select(base, counts, _ranks(base, counts, rolled) + offsets))
+
+
+def busday_count(calendar: at.Calendar, begins: Any, ends: Any) -> ArrayType:
+    """Return the counts of workdays within [begin, end) or negated within (end, begin] (as Calendar.busday_count)."""
+    begins, ends = np.broadcast_arrays(_ordinals(begins), _ordinals(ends))
+    if not begins.size:
+        return np.zeros(begins.shape, dtype='int64')
+    base, counts = _table_for(calendar, np.concatenate([begins.ravel(), ends.ravel()]))
+    shift = (ends >= begins).astype('int64')
+    return _ranks(base, counts, ends - shift) - _ranks(base, counts, begins - shift)
@@ -0,0 +1,173 @@
+#! /usr/bin/env python3
+"""Micro-benchmark the calendar functions against synthetic configurations and compare with the baseline.
+
+Usage: python -m bin.bench_calendar [--quick] [--update] [--tolerance FACTOR] [--baseline PATH]
+"""
+
+import argparse
+import datetime as dti
+import gc
+import json
+import pathlib
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+import arbejdstimer.arbejdstimer as at
+
+DB = pathlib.Path('etc/bench-calendar.json')
+ENCODING = 'utf-8'
+SEED = 42
+REPEATS = 5
+QUICK_REPEATS = 1
+TOLERANCE = 1.5
+
+# name, holiday entries, share of ranges among the entries, first year, last year
+SCENARIOS = (
+    ('tiny', 10, 0.2, 2022, 2023),
+    ('thousand', 1_000, 0.2, 2000, 2030),
+    ('many-ranges', 1_000, 1.0, 1990, 2030),
+    ('multi-decade', 10_000, 0.1, 1950, 2049),
+    ('hundred-thousand', 100_000, 0.05, 1900, 2099),
+)
+QUICK_SCENARIOS = ('tiny', 'thousand')
+
+
+def synthetic_config(entries: int, range_share: float, first_year: int, last_year: int, seed: int = SEED) -> dict:
+    """Return a valid configuration with the count of holiday entries spread over the closed year interval."""
+    rng = random.Random(seed)
+    low, high = dti.date(first_year, 1, 1).toordinal(), dti.date(last_year, 12, 31).toordinal()
+    holidays = []
+    for n in range(entries):
+        start = rng.randint(low, high)
+        days = [dti.date.fromordinal(start)]
+        if rng.random() < range_share:
+            days.append(dti.date.fromordinal(min(start + rng.randint(1, 14), high)))
+        holidays.append({'label': f'synthetic {n}', 'at': [day.strftime(at.DATE_FMT) for day in days]})
+    return {
+        'api': 1,
+        'application': 'arbejdstimer',
+        'operator': 'or',
+        'holidays': holidays,
+        'working_hours': [8, 17],
+    }
+
+
+def measure(function: Callable[[], Any], repeats: int) -> dict[str, float]:
+    """Return the best and median wall time (seconds) and the peak traced memory (bytes) of the function."""
+    timings = []
+    for _ in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    timings.sort()
+    return {'best_s': timings[0], 'median_s': timings[len(timings) // 2], 'peak_bytes': peak}
+
+
+def cases(config: dict, first_year: int, last_year: int) -> dict[str, Callable[[], Any]]:
+    """Return the benchmark cases for the configuration keyed by function name."""
+    _, _, holidays, working_hours = at.load(config)
+    middle = (first_year + last_year) // 2
+    span = [dti.date(first_year, 1, 1) + dti.timedelta(days=n) for n in range((last_year - first_year + 1) * 365)]
+    work_days = at.workdays(holidays, span)
+    index = at.workday_index(work_days)
+    month, first_month, last_month = f'{middle}-06', f'{middle}-01', f'{middle}-12'
+    calendar = at.Calendar(holidays, working_hours)
+    first_day, last_day = dti.date(first_year, 1, 1), dti.date(last_year, 12, 31)
+    return {
+        'load': lambda: at.load(config),
+        'workdays_of_year': lambda: at.workdays(holidays, at.days_of_year(dti.date(middle, 1, 1))),
+        'workdays_of_span': lambda: at.workdays(holidays, span),
+        'workday_index': lambda: at.workday_index(work_days),
+        'workdays_count_per_month': lambda: at.workdays_count_per_month(work_days),
+        'cumulative_workdays_count_per_month': lambda: at.cumulative_workdays_count_per_month(work_days),
+        'workdays_count_of_year_in_between': lambda: at.workdays_count_of_year_in_between(
+            index, month, 15, first_month, last_month
+        ),
+        'remaining_workdays_count_of_year_in_between': lambda: at.remaining_workdays_count_of_year_in_between(
+            index, month, 15, first_month, last_month
+        ),
+        'calendar_workday_count': lambda: calendar.workday_count(first_day, last_day),
+    }
+
+
+def run(quick: bool = False) -> dict[str, Any]:
+    """Run all (or only the quick) scenarios and return the results."""
+    repeats = QUICK_REPEATS if quick else REPEATS
+    results: dict[str, Any] = {}
+    for name, entries, range_share, first_year, last_year in SCENARIOS:
+        if quick and name not in QUICK_SCENARIOS:
+            continue
+        print(f'scenario ({name}): {entries} entries over {first_year}-{last_year}', file=sys.stderr)
+        config = synthetic_config(entries, range_share, first_year, last_year)
+        results[name] = {
+            function: measure(case, repeats) for function, case in cases(config, first_year, last_year).items()
+        }
+    return results
+
+
+def report(results: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> int:
+    """Print a table of the results against the baseline and return the count of regressions."""
+    regressions = 0
+    for scenario, functions in results.items():
+        for function, metrics in functions.items():
+            known = baseline.get(scenario, {}).get(function, {})
+            ratio = metrics['best_s'] / known['best_s'] if known.get('best_s') else None
+            flag = ''
+            if ratio is not None and ratio > tolerance:
+                flag = ' REGRESSION'
+                regressions += 1
+            shown = f'{ratio:6.2f}x' if ratio is not None else '    new'
+            print(
+                f'{scenario:<17} {function:<44} {metrics["best_s"] * 1e3:10.3f} ms'
+                f' {metrics["peak_bytes"] / 1024:10.1f} KiB {shown}{flag}'
+            )
+    return regressions
+
+
+def main(argv: list[str]) -> int:
+    """Run the benchmarks, report against the baseline, and optionally update the baseline."""
+    parser = argparse.ArgumentParser(prog='bench_calendar', description=__doc__.splitlines()[0])
+    parser.add_argument('--quick', action='store_true', help='only run the small scenarios once')
+    parser.add_argument('--update', action='store_true', help='store the results as new baseline')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help='slowdown factor counted as regression')
+    parser.add_argument('--baseline', type=pathlib.Path, default=DB, help='path to the baseline file')
+    options = parser.parse_args(argv)
+
+    baseline: dict[str, Any] = {}
+    if options.baseline.is_file():
+        with options.baseline.open('rt', encoding=ENCODING) as handle:
+            baseline = json.load(handle).get('results', {})
+
+    results = run(options.quick)
+    regressions = report(results, baseline, options.tolerance)
+
+    if options.update:
+        document = {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'timestamp': dti.datetime.now(tz=dti.timezone.utc).strftime('%Y-%m-%d %H:%M:%S +00:00'),
+            'results': results,
+        }
+        with options.baseline.open('wt', encoding=ENCODING) as handle:
+            json.dump(document, handle, indent=2)
+            handle.write('\n')
+        return 0
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,153 @@
+#! /usr/bin/env python3
+"""Measure the cold-start latency of the command line entry points and compare with the baseline.
+
+Usage: python -m bin.bench_startup [--runs N] [--update] [--tolerance FACTOR] [--baseline PATH]
+"""
+
+import argparse
+import datetime as dti
+import json
+import os
+import pathlib
+import platform
+import statistics
+import subprocess  # nosec
+import sys
+import tempfile
+import time
+from typing import Any
+
+DB = pathlib.Path('etc/bench-startup.json')
+ENCODING = 'utf-8'
+RUNS = 50
+WARMUP_RUNS = 3
+TOLERANCE = 1.5
+TOP_IMPORTS = 15
+CONFIG = 'test/fixtures/basic/holidays-config.json'
+CACHE_VAR = 'ARBEJDSTIMER_CACHE'
+
+# name, arguments after the interpreter, use the compiled cache
+ENTRY_POINTS = (
+    ('now', ['-m', 'arbejdstimer', 'now', '-c', CONFIG], False),
+    ('now-cached', ['-m', 'arbejdstimer', 'now', '-c', CONFIG], True),
+    ('explain', ['-m', 'arbejdstimer', 'explain', '-c', CONFIG], False),
+    ('explain-cached', ['-m', 'arbejdstimer', 'explain', '-c', CONFIG], True),
+    ('typer-version', ['-m', 'arbejdstimer', 'version'], False),
+    ('interpreter', ['-c', 'pass'], False),
+)
+
+
+def environment(cache_folder: str, cached: bool) -> dict[str, str]:
+    """Return the process environment with the compiled cache enabled or disabled."""
+    env = dict(os.environ)
+    env.pop(CACHE_VAR, None)
+    if cached:
+        env[CACHE_VAR] = cache_folder
+    return env
+
+
+def spawn(arguments: list[str], env: dict[str, str]) -> float:
+    """Run the interpreter with the arguments once and return the wall time in seconds."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, *arguments], env=env, capture_output=True, check=False)  # nosec
+    return time.perf_counter() - start
+
+
+def percentile(samples: list[float], share: float) -> float:
+    """Return the nearest rank percentile of the samples."""
+    ordered = sorted(samples)
+    rank = max(int(round(share * len(ordered) + 0.5)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def import_times(arguments: list[str], env: dict[str, str], top: int = TOP_IMPORTS) -> list[dict[str, Any]]:
+    """Return the top level imports with the largest cumulative import time (microseconds) from -X importtime."""
+    completed = subprocess.run(  # nosec
+        [sys.executable, '-X', 'importtime', *arguments], env=env, capture_output=True, check=False, text=True
+    )
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:') :].split('|')
+        if len(name) - len(name.lstrip()) == 1:  # top level imports are indented by the separating blank only
+            entries.append({'module': name.strip(), 'self_us': int(self_us), 'cumulative_us': int(cumulative_us)})
+    entries.sort(key=lambda entry: entry['cumulative_us'], reverse=True)
+    return entries[:top]
+
+
+def run(runs: int) -> dict[str, Any]:
+    """Spawn every entry point runs times and return latency percentiles and import time breakdowns."""
+    results: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as cache_folder:
+        for name, arguments, cached in ENTRY_POINTS:
+            env = environment(cache_folder, cached)
+            for _ in range(WARMUP_RUNS):
+                spawn(arguments, env)
+            samples = [spawn(arguments, env) for _ in range(runs)]
+            results[name] = {
+                'runs': runs,
+                'p50_ms': percentile(samples, 0.50) * 1e3,
+                'p95_ms': percentile(samples, 0.95) * 1e3,
+                'p99_ms': percentile(samples, 0.99) * 1e3,
+                'mean_ms': statistics.fmean(samples) * 1e3,
+                'imports': import_times(arguments, env),
+            }
+            print(f'entry point ({name}) measured', file=sys.stderr)
+    return results
+
+
+def report(results: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> int:
+    """Print a table of the results against the baseline and return the count of regressions."""
+    regressions = 0
+    for name, metrics in results.items():
+        known = baseline.get(name, {})
+        ratio = metrics['p50_ms'] / known['p50_ms'] if known.get('p50_ms') else None
+        flag = ''
+        if ratio is not None and ratio > tolerance:
+            flag = ' REGRESSION'
+            regressions += 1
+        shown = f'{ratio:6.2f}x' if ratio is not None else '    new'
+        print(
+            f'{name:<15} p50 {metrics["p50_ms"]:8.1f} ms  p95 {metrics["p95_ms"]:8.1f} ms'
+            f'  p99 {metrics["p99_ms"]:8.1f} ms {shown}{flag}'
+        )
+        for entry in metrics['imports'][:3]:
+            print(f'{"":<15}   {entry["module"]:<30} {entry["cumulative_us"] / 1e3:8.1f} ms cumulative import')
+    return regressions
+
+
+def main(argv: list[str]) -> int:
+    """Run the harness, report against the baseline, and optionally update the baseline."""
+    parser = argparse.ArgumentParser(prog='bench_startup', description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=RUNS, help='process spawns per entry point')
+    parser.add_argument('--update', action='store_true', help='store the results as new baseline')
+    parser.add_argument('--tolerance', type=float, default=TOLERANCE, help='slowdown factor counted as regression')
+    parser.add_argument('--baseline', type=pathlib.Path, default=DB, help='path to the baseline file')
+    options = parser.parse_args(argv)
+
+    baseline: dict[str, Any] = {}
+    if options.baseline.is_file():
+        with options.baseline.open('rt', encoding=ENCODING) as handle:
+            baseline = json.load(handle).get('results', {})
+
+    results = run(max(options.runs, 1))
+    regressions = report(results, baseline, options.tolerance)
+
+    if options.update:
+        document = {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'timestamp': dti.datetime.now(tz=dti.timezone.utc).strftime('%Y-%m-%d %H:%M:%S +00:00'),
+            'results': results,
+        }
+        with options.baseline.open('wt', encoding=ENCODING) as handle:
+            json.dump(document, handle, indent=2)
+            handle.write('\n')
+        return 0
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
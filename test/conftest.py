@@ -13,6 +13,8 @@ CFG_FS_TRIPLET_HOLIDAYS = pathlib.Path('test', 'fixtures', 'basic', 'triplet-hol
 CFG_FS_NOT_THERE = pathlib.Path('does', 'not', 'exist', 'hypothetical.json')
 CFG_FS_NO_JSON_EXTENSION = pathlib.Path('test', 'fixtures', 'basic', 'this-has-no-json-extens.ion')
 CFG_FS_INVALID_MINIMAL = pathlib.Path('test', 'fixtures', 'basic', 'invalid-minimal-config.json')
+CFG_FS_HOLIDAY_RULES = pathlib.Path('test', 'fixtures', 'basic', 'holiday-rules-config.json')
+CFG_FS_SHIFTS = pathlib.Path('test', 'fixtures', 'basic', 'shifts-config.json')
 CFG_PY_EMPTY = {
     'operator': 'or',
 }
@@ -33,6 +35,12 @@ with open(CFG_FS_HOLIDAYS, 'rt', encoding=ENCODING) as handle:
 with open(CFG_FS_TRIPLET_HOLIDAYS, 'rt', encoding=ENCODING) as handle:
     CFG_PY_TRIPLET_HOLIDAYS = json.load(handle)
 
+with open(CFG_FS_HOLIDAY_RULES, 'rt', encoding=ENCODING) as handle:
+    CFG_PY_HOLIDAY_RULES = json.load(handle)
+
+with open(CFG_FS_SHIFTS, 'rt', encoding=ENCODING) as handle:
+    CFG_PY_SHIFTS = json.load(handle)
+
 
 def always_monday(date: dti.date) -> int:  # type: ignore
     """Return current weekday mock for Monday."""
@@ -54,6 +62,11 @@ def always_weekend(day_number: int) -> bool:  # type: ignore
     return False
 
 
+def a_working_monday() -> dti.date:
+    """Return the current date mock for a Monday that is no holiday in the fixtures."""
+    return dti.date(2022, 10, 24)
+
+
 def the_zero_hour() -> int:
     """Return the hour of day as integer within [0, 23] mock 0."""
     return 0
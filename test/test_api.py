@@ -109,6 +109,75 @@ def test_api_today():
     today_rep = fix.TODAY.strftime(at.DATE_FMT)
     expected = (
         '{"api":1,"application":"arbejdstimer","operator":"or",'
-        f'"holidays":[{{"label":"","at":["{today_rep}"]}}],"working_hours":[8,17]}}'
+        f'"holidays":[{{"label":"","at":["{today_rep}"]}}],"holiday_rules":null,"weekmask":null,"working_hours":[8,17],"shifts":null}}'
     )
     assert cfg.model_dump_json() == expected
+
+
+def test_api_holiday_rules():
+    rules = api.HolidayRules(fix.CFG_PY_HOLIDAY_RULES['holiday_rules'])  # type: ignore
+    assert [(rule.month, rule.day, rule.weekday, rule.nth, rule.easter) for rule in rules.root][:3] == [
+        (12, 24, None, None, None),
+        (1, 1, None, None, None),
+        (None, None, None, None, -2),
+    ]
+    assert api.HolidayRule(month=2, day=29).day == 29
+
+
+@pytest.mark.parametrize(
+    'data, message_part',
+    [
+        ({'month': 2, 'day': 30}, 'day (30) does not exist in month (2)'),
+        ({'month': 5, 'weekday': 1, 'nth': 0}, 'nth must not be zero'),
+        ({'month': 5, 'day': 1, 'easter': 1}, 'rule must be one of'),
+        ({'month': 5, 'weekday': 1}, 'rule must be one of'),
+        ({'label': 'nothing'}, 'rule must be one of'),
+        ({'easter': 400}, 'Input should be less than or equal to 366'),
+    ],
+)
+def test_api_holiday_rule_invalid(data, message_part):
+    with pytest.raises(ValidationError, match=_subs(1, 'HolidayRule')) as err:
+        _ = api.HolidayRule(**data)  # type: ignore
+    assert message_part in str(err.value)
+
+
+def test_api_weekmask():
+    assert api.Weekmask('1111001').root == '1111001'  # type: ignore
+    cfg = api.Arbejdstimer(operator='or', weekmask='1111000')  # type: ignore
+    assert cfg.weekmask.root == '1111000'  # type: ignore
+
+
+@pytest.mark.parametrize(
+    'text, message_part',
+    [
+        ('0000000', 'weekmask must hold at least one workday'),
+        ('111110', "String should match pattern '^[01]{7}$'"),
+        ('1111102', "String should match pattern '^[01]{7}$'"),
+    ],
+)
+def test_api_weekmask_invalid(text, message_part):
+    with pytest.raises(ValidationError, match=_subs(1, 'Weekmask')) as err:
+        _ = api.Weekmask(text)  # type: ignore
+    assert message_part in str(err.value)
+
+
+def test_api_shifts():
+    shifts = api.Shifts(fix.CFG_PY_SHIFTS['shifts'])  # type: ignore
+    assert [weekday.root for weekday in shifts.root[0].weekdays] == [1, 2, 3, 4]
+    assert [clock.root for clock in shifts.root[1].at[0].root] == ['08:00', '13:30']
+    assert api.ClockRange(['22:00', '24:00']).root[1].root == '24:00'  # type: ignore
+
+
+@pytest.mark.parametrize(
+    'data, message_part',
+    [
+        (['12:00', '08:00'], 'shift start (12:00) must be before end (08:00)'),
+        (['08:00', '08:00'], 'shift start (08:00) must be before end (08:00)'),
+        (['08:00', '24:30'], 'String should match pattern'),
+        (['8:00', '12:00'], 'String should match pattern'),
+    ],
+)
+def test_api_clock_range_invalid(data, message_part):
+    with pytest.raises(ValidationError, match=_subs(1, 'ClockRange')) as err:
+        _ = api.ClockRange(data)  # type: ignore
+    assert message_part in str(err.value)
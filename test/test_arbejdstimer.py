@@ -1,4 +1,5 @@
 import datetime as dti
+import random
 import test.conftest as fix
 
 import pytest
@@ -30,7 +31,8 @@ def test_at_main_now_load_error_processing(capsys):
     assert not err
 
 
-def test_at_main_explain():
+def test_at_main_explain(monkeypatch):
+    monkeypatch.setattr(at, 'the_day', fix.a_working_monday)
     assert at.main(('explain', '', str(fix.CFG_FS_HOLIDAYS), True)) in (0, 1)
 
 
@@ -199,39 +201,39 @@ def test_at_load_triplet_holidays():
     assert hours == tuple(fix.CFG_PY_TRIPLET_HOLIDAYS['working_hours'])
 
 
-def test_at_apply_now_monday_noon():
-    at.weekday = fix.always_monday
-    at.the_hour = fix.the_noon_hour
+def test_at_apply_now_monday_noon(monkeypatch):
+    monkeypatch.setattr(at, 'weekday', fix.always_monday)
+    monkeypatch.setattr(at, 'the_hour', fix.the_noon_hour)
     expected = (2, '- empty date range of configuration')
     assert at.apply([], at.DEFAULT_WORK_HOURS_MARKER, 'now', TODAY, True) == expected
 
 
-def test_at_apply_now_sunday_noon():
-    at.weekday = fix.always_sunday
-    at.the_hour = fix.the_noon_hour
+def test_at_apply_now_sunday_noon(monkeypatch):
+    monkeypatch.setattr(at, 'weekday', fix.always_sunday)
+    monkeypatch.setattr(at, 'the_hour', fix.the_noon_hour)
     error, message = at.apply([dti.date.today()], at.DEFAULT_WORK_HOURS_MARKER, 'now', TODAY, True)
     assert error == 2
     assert message == '- Day is not within year range of configuration'
 
 
-def test_at_apply_now_monday_midnight():
-    at.weekday = fix.always_monday
-    at.the_hour = fix.the_zero_hour
+def test_at_apply_now_monday_midnight(monkeypatch):
+    monkeypatch.setattr(at, 'weekday', fix.always_monday)
+    monkeypatch.setattr(at, 'the_hour', fix.the_zero_hour)
     expected = (2, '- empty date range of configuration')
     assert at.apply([], at.DEFAULT_WORK_HOURS_MARKER, 'now', TODAY, True) == expected
 
 
-def test_at_apply_now_sunday_midnight():
-    at.weekday = fix.always_sunday
-    at.the_hour = fix.the_zero_hour
+def test_at_apply_now_sunday_midnight(monkeypatch):
+    monkeypatch.setattr(at, 'weekday', fix.always_sunday)
+    monkeypatch.setattr(at, 'the_hour', fix.the_zero_hour)
     error, message = at.apply([dti.date.today()], at.DEFAULT_WORK_HOURS_MARKER, 'now', TODAY, True)
     assert error == 2
     assert message == '- Day is not within year range of configuration'
 
 
-def test_at_apply_explain_monday_noon(capsys):
-    at.weekday = fix.always_monday
-    at.the_hour = fix.the_noon_hour
+def test_at_apply_explain_monday_noon(monkeypatch, capsys):
+    monkeypatch.setattr(at, 'weekday', fix.always_monday)
+    monkeypatch.setattr(at, 'the_hour', fix.the_noon_hour)
     expected = (2, '- Day is not within year range of configuration')
     assert at.apply([dti.date.today()], at.DEFAULT_WORK_HOURS_MARKER, 'explain', TODAY, True) == expected
     out, err = capsys.readouterr()
@@ -321,3 +323,492 @@ def test_remaining_workdays_count_of_year_in_between():
     assert remaining(work_days, '2022-01', 4, '2022-01', '2022-01') == 0
     assert remaining(work_days, '2022-01', 2, '2022-01', '2022-01') == 1
     assert remaining(work_days, '2022-01', 4, '2022-07', '2022-08') == 2
+
+
+def test_off_days_index_membership():
+    off_days = at.OffDays([dti.date(2022, 12, 23), dti.date(2022, 12, 24)])
+    assert off_days == [dti.date(2022, 12, 23), dti.date(2022, 12, 24)]
+    assert dti.date(2022, 12, 24) in off_days
+    assert dti.date(2022, 12, 25) not in off_days
+    assert 'not a date' not in off_days
+    assert off_days.intervals == [(dti.date(2022, 12, 23).toordinal(), dti.date(2022, 12, 24).toordinal())]
+    assert at.holiday_index(off_days) is off_days
+    assert dti.date(2022, 12, 23) in at.holiday_index([dti.date(2022, 12, 23)])
+
+
+def test_at_load_holidays_indexed():
+    error, message, holidays, _ = at.load(fix.CFG_PY_HOLIDAYS)
+    assert not error
+    assert not message
+    assert isinstance(holidays, at.OffDays)
+    assert len(holidays.intervals) < len(holidays) == len(holidays.dates())
+    assert all(holiday in holidays for holiday in holidays)
+
+
+def _naive_year_in_between(work_days, month, day, first_month, last_month, remaining=False):
+    """Reference implementation walking every workday."""
+    count = 0
+    for d in work_days:
+        ds = d.strftime(at.YEAR_MONTH_FORMAT)
+        if first_month <= ds <= last_month:
+            if remaining and (ds == month and d.day > day or ds > month):
+                count += 1
+            if not remaining and (ds < month or ds == month and d.day <= day):
+                count += 1
+    return count
+
+
+def test_workday_index_matches_naive_counts():
+    days = [dti.date(2021, 11, 1) + dti.timedelta(days=n) for n in range(500)]
+    work_days = [d for d in days if d.isoweekday() < 6 and d.day != 13]
+    index = at.workday_index(work_days)
+    assert at.workday_index(index) is index
+    assert len(index) == len(work_days)
+    months = sorted({d.strftime(at.YEAR_MONTH_FORMAT) for d in work_days})
+    for month in months[::3]:
+        for day in (0, 1, 13, 15, 28, 31, 42):
+            for first_month, last_month in ((months[0], months[-1]), (months[2], months[9]), (month, month)):
+                for remaining in (False, True):
+                    expected = _naive_year_in_between(work_days, month, day, first_month, last_month, remaining)
+                    counter = (
+                        at.remaining_workdays_count_of_year_in_between
+                        if remaining
+                        else at.workdays_count_of_year_in_between
+                    )
+                    assert counter(index, month, day, first_month, last_month) == expected
+                    assert counter(work_days, month, day, first_month, last_month) == expected
+            in_month = sum(1 for d in work_days if d.strftime(at.YEAR_MONTH_FORMAT) == month and d.day <= day)
+            assert at.workdays_count_of_month_in_between(index, month, day, months[0], months[-1]) == in_month
+
+
+def test_workday_index_malformed_month():
+    work_days = [dti.date(2022, 1, 3), dti.date(2022, 7, 1)]
+    assert at.month_key('2022-13') is None
+    assert at.month_key(None) is None
+    assert at.workdays_count_of_year_in_between(work_days, '2022/01', 4) == 0
+    assert at.workdays_count_of_year_in_between([], '2022-01', 4) == 0
+
+
+def test_cumulative_workdays_count_per_month_multi_year():
+    work_days = [dti.date(2020, 12, 31), dti.date(2021, 1, 4), dti.date(2021, 1, 5), dti.date(2022, 2, 1)]
+    cum = at.cumulative_workdays_count_per_month
+    assert cum(work_days) == {'2020-12': 1, '2021-01': 3, '2022-02': 4}
+    assert cum(work_days, years=range(2021, 2023)) == {'2021-01': 2, '2022-02': 3}
+    assert cum(at.workday_index(work_days)) == cum(work_days)
+    assert cum(at.workday_index(work_days), years={2022}) == {'2022-02': 1}
+    assert at.workdays_count_per_month(work_days, years=(2021,)) == {'2021-01': 2}
+    assert at.workdays_count_per_month(at.workday_index(work_days)) == {'2020-12': 1, '2021-01': 2, '2022-02': 1}
+
+
+def test_off_days_merged_intervals():
+    day = dti.date(2023, 1, 1)
+    off_days = at.OffDays(
+        dates=[day + dti.timedelta(days=9)],
+        intervals=[(day.toordinal(), day.toordinal() + 3), (day.toordinal() + 2, day.toordinal() + 5)],
+    )
+    assert off_days.intervals == [(day.toordinal(), day.toordinal() + 5), (day.toordinal() + 9,) * 2]
+    assert len(off_days) == 7
+    assert off_days[0] == day
+    assert off_days[-1] == day + dti.timedelta(days=9)
+    assert off_days[6] == day + dti.timedelta(days=9)
+    assert off_days[1:3] == [day + dti.timedelta(days=1), day + dti.timedelta(days=2)]
+    assert day + dti.timedelta(days=5) in off_days
+    assert day + dti.timedelta(days=6) not in off_days
+    assert day - dti.timedelta(days=1) not in off_days
+    assert off_days == at.OffDays(off_days.dates())
+    assert off_days != 'holidays'
+    with pytest.raises(IndexError):
+        _ = off_days[7]
+
+
+def test_at_load_long_range_not_expanded():
+    cfg = {'operator': 'or', 'holidays': [{'at': ['2030-12-31', '2000-01-01']}, {'at': ['2010-06-01']}]}
+    error, message, holidays, _ = at.load(cfg)
+    assert not error
+    assert holidays.intervals == [(dti.date(2000, 1, 1).toordinal(), dti.date(2030, 12, 31).toordinal())]
+    assert len(holidays) == (dti.date(2030, 12, 31) - dti.date(2000, 1, 1)).days + 1
+    assert holidays[-1] == dti.date(2030, 12, 31)
+
+
+def test_calendar_is_immutable():
+    calendar = at.Calendar()
+    with pytest.raises(AttributeError):
+        calendar.hours = (0, 23)  # type: ignore
+    with pytest.raises(AttributeError):
+        del calendar.holidays
+    with pytest.raises(AttributeError):
+        calendar.extra = True  # type: ignore
+    assert calendar.hours == at.DEFAULT_WORK_HOURS_CLOSED_INTERVAL
+
+
+def test_calendar_explain_has_no_side_effects(capsys):
+    _, _, holidays, working_hours = at.load(fix.CFG_PY_HOLIDAYS)
+    calendar = at.Calendar(holidays, working_hours)
+    monday = dti.date(2022, 10, 24)
+    assert calendar.explain(monday, 12, strict=True) == (
+        0,
+        '',
+        [
+            f'- Day ({monday}) is within date range of configuration',
+            f'- Day ({monday}) is not a holiday',
+            f'- Day ({monday}) is not a weekend',
+            '- At this hour (12) is work time',
+        ],
+    )
+    assert calendar.check(monday, 20) == (1, '- No worktime at hour(20).')
+    assert calendar.check(dti.date(2022, 12, 8)) == (1, '- Day is a holiday.')
+    assert calendar.check(dti.date(2022, 10, 23)) == (1, '- Day is weekend.')
+    assert calendar.check(dti.date(2030, 1, 1), strict=True)[0] == 2
+    assert at.Calendar().check(monday, strict=True) == (2, '- empty date range of configuration')
+    assert capsys.readouterr() == ('', '')
+
+
+def test_calendar_next_work_time_skips_holiday_interval():
+    _, _, holidays, working_hours = at.load(fix.CFG_PY_HOLIDAYS)
+    calendar = at.Calendar(holidays, working_hours)
+    friday_evening = dti.datetime(2022, 12, 23, 18, 30)
+    assert calendar.next_work_time(friday_evening) == dti.datetime(2023, 1, 3, 8)
+    assert calendar.next_work_time(dti.datetime(2022, 10, 24, 6)) == dti.datetime(2022, 10, 24, 8)
+    assert calendar.next_work_time(dti.datetime(2022, 10, 24, 9, 15)) == dti.datetime(2022, 10, 24, 9, 15)
+
+
+def test_calendar_workday_count_matches_naive_count():
+    _, _, holidays, _ = at.load(fix.CFG_PY_HOLIDAYS)
+    calendar = at.Calendar(holidays)
+    first = dti.date(2022, 11, 28)
+    for span in (0, 1, 6, 7, 40, 400, 800):
+        last = first + dti.timedelta(days=span)
+        naive = sum(
+            1
+            for n in range(span + 1)
+            if (first + dti.timedelta(days=n)).isoweekday() < 6 and first + dti.timedelta(days=n) not in holidays
+        )
+        assert calendar.workday_count(first, last) == naive
+    assert calendar.workday_count(first, first - dti.timedelta(days=1)) == 0
+    assert calendar.workdays(2023) == at.workdays(holidays, at.days_of_year(dti.date(2023, 1, 1)))
+
+
+def _naive_transition(calendar, moment):
+    state = calendar.is_work_time(moment)
+    probe = moment.replace(minute=0, second=0, microsecond=0) + dti.timedelta(hours=1)
+    while calendar.is_work_time(probe) == state:
+        probe += dti.timedelta(hours=1)
+    return probe
+
+
+def test_calendar_next_transition_matches_hourly_stepping():
+    day = dti.date(2023, 1, 1)
+    rng = random.Random(2023)
+    intervals = []
+    for _ in range(40):
+        start = day.toordinal() + rng.randint(0, 700)
+        intervals.append((start, start + rng.randint(0, 9)))
+    for working_hours in ((8, 17), (0, 23), (6, 23), (0, 11)):
+        calendar = at.Calendar(at.OffDays(intervals=intervals), working_hours)
+        for offset in range(0, 730 * 24, 37):
+            moment = dti.datetime.combine(day, dti.time(0, 15)) + dti.timedelta(hours=offset)
+            assert calendar.next_transition(moment) == _naive_transition(calendar, moment), (working_hours, moment)
+
+
+def test_calendar_skips_long_holiday_runs():
+    first = dti.date(2000, 1, 3)
+    calendar = at.Calendar(at.OffDays(intervals=[(first.toordinal(), dti.date(2030, 12, 27).toordinal())]))
+    assert calendar.next_workday(first) == dti.date(2030, 12, 30)
+    assert calendar.previous_workday(dti.date(2030, 12, 29)) == dti.date(1999, 12, 31)
+    assert calendar.next_off_day(dti.date(1999, 12, 28)) == dti.date(2000, 1, 1)
+    assert calendar.workday_count(dti.date(1999, 12, 31), dti.date(2030, 12, 30)) == 2
+    assert sorted(calendar.masks)[0] == 1999
+    assert calendar.next_off_time(dti.datetime(1999, 12, 31, 10)) == dti.datetime(1999, 12, 31, 17)
+    assert calendar.next_off_time(dti.datetime(1999, 12, 31, 20)) == dti.datetime(1999, 12, 31, 20)
+
+
+def _naive_work_minutes(calendar, first, last):
+    minutes, probe = 0, first
+    while probe < last:
+        minutes += calendar.is_work_time(probe)
+        probe += dti.timedelta(minutes=1)
+    return minutes
+
+
+def test_calendar_work_time_between_matches_minute_stepping():
+    _, _, holidays, working_hours = at.load(fix.CFG_PY_HOLIDAYS)
+    calendar = at.Calendar(holidays, working_hours)
+    first = dti.datetime(2022, 12, 20, 7, 30)
+    for last in (
+        dti.datetime(2022, 12, 20, 7, 45),
+        dti.datetime(2022, 12, 20, 12, 10),
+        dti.datetime(2022, 12, 22, 23, 0),
+        dti.datetime(2023, 1, 3, 8, 1),
+        dti.datetime(2023, 1, 16, 17, 59),
+    ):
+        expected = dti.timedelta(minutes=_naive_work_minutes(calendar, first, last))
+        assert calendar.work_time_between(first, last) == expected
+        assert calendar.work_time_between(last, first) == -expected
+        assert calendar.add_work_time(first, expected) <= last
+        spent = calendar.add_work_time(first, expected)
+        assert _naive_work_minutes(calendar, first, spent) * 60 == expected.total_seconds()
+
+
+def test_calendar_add_work_time_across_years():
+    calendar = at.Calendar(
+        at.OffDays(intervals=[(dti.date(2023, 1, 2).toordinal(), dti.date(2023, 12, 29).toordinal())])
+    )
+    moment = dti.datetime(2022, 12, 30, 16, 30)
+    assert calendar.add_work_time(moment, dti.timedelta(minutes=30)) == dti.datetime(2022, 12, 30, 17)
+    assert calendar.add_work_time(moment, dti.timedelta(hours=1)) == dti.datetime(2024, 1, 1, 7, 30)
+    assert calendar.add_work_time(moment, dti.timedelta(hours=10, minutes=30)) == dti.datetime(2024, 1, 1, 17)
+    assert calendar.add_work_time(moment, dti.timedelta(0)) == moment
+    assert calendar.work_time_between(moment, dti.datetime(2024, 1, 2, 8)) == dti.timedelta(hours=11, minutes=30)
+    assert calendar.workday_after(dti.date(2022, 12, 30), 1) == dti.date(2024, 1, 1)
+    assert calendar.workday_before(dti.date(2024, 1, 1), 2) == dti.date(2022, 12, 29)
+    with pytest.raises(ValueError):
+        calendar.add_work_time(moment, dti.timedelta(hours=-1))
+
+
+def test_parse_and_format_duration():
+    assert at.parse_duration('7:30') == dti.timedelta(hours=7, minutes=30)
+    assert at.parse_duration('1.25') == dti.timedelta(hours=1, minutes=15)
+    with pytest.raises(ValueError):
+        at.parse_duration('1:75')
+    assert at.format_duration(dti.timedelta(hours=-26, minutes=-5)) == '-26:05'
+
+
+def test_calendar_busday_offset_roll_and_count():
+    _, _, holidays, working_hours = at.load(fix.CFG_PY_HOLIDAYS)
+    calendar = at.Calendar(holidays, working_hours)
+    saturday = dti.date(2022, 12, 24)
+    assert calendar.busday_roll(saturday) == dti.date(2023, 1, 3)
+    assert calendar.busday_roll(saturday, 'backward') == dti.date(2022, 12, 22)
+    assert calendar.busday_roll(dti.date(2022, 12, 31), 'modifiedfollowing') == dti.date(2022, 12, 22)
+    assert calendar.busday_roll(dti.date(2022, 10, 24), 'raise') == dti.date(2022, 10, 24)
+    with pytest.raises(ValueError):
+        calendar.busday_roll(saturday, 'raise')
+    with pytest.raises(ValueError):
+        calendar.busday_roll(saturday, 'sideways')
+    assert calendar.busday_offset(dti.date(2022, 12, 22), 1) == dti.date(2023, 1, 3)
+    assert calendar.busday_offset(dti.date(2023, 1, 3), -1) == dti.date(2022, 12, 22)
+    assert calendar.busday_offset(saturday, 17, 'forward') == dti.date(2023, 1, 26)
+    assert calendar.busday_count(dti.date(2022, 12, 22), dti.date(2023, 1, 4)) == 2
+    assert calendar.busday_count(dti.date(2023, 1, 4), dti.date(2022, 12, 22)) == -2
+    for span in range(0, 60, 7):
+        first, last = dti.date(2022, 12, 1), dti.date(2022, 12, 1) + dti.timedelta(days=span)
+        assert calendar.busday_count(first, last) == calendar.workday_count(first, last - dti.timedelta(days=1))
+
+
+def test_calendar_operator_set_algebra_matches_naive_sets():
+    listed = {dti.date(2023, 1, 7), dti.date(2023, 1, 9), dti.date(2023, 5, 1), dti.date(2023, 12, 24)}
+    days = at.days_of_year(dti.date(2023, 1, 1))
+    weekend = {day for day in days if day.isoweekday() > 5}
+    expected_off = {'or': weekend | listed, 'and': weekend & listed, 'xor': weekend ^ listed}
+    for operator, off in expected_off.items():
+        calendar = at.Calendar(at.OffDays(sorted(listed), operator=operator))
+        assert [day for day in days if not calendar.is_workday(day)] == sorted(off), operator
+        assert calendar.workday_count(days[0], days[-1]) == len(days) - len(off)
+        assert calendar.workdays(2023) == at.workdays(calendar.holidays, days)
+
+
+def test_at_load_operator_xor_works_listed_weekend():
+    cfg = {'operator': 'xor', 'holidays': [{'at': ['2023-01-07']}, {'at': ['2023-01-09']}, {'at': ['2023-12-31']}]}
+    error, _, holidays, working_hours = at.load(cfg)
+    assert not error
+    assert holidays.operator == 'xor'
+    calendar = at.Calendar(holidays, working_hours)
+    assert calendar.explain(dti.date(2023, 1, 7), 10) == (
+        0,
+        '',
+        [
+            '- Day (2023-01-07) is a holiday but a workday per operator (xor)',
+            '- Day (2023-01-07) is a weekend day but a workday per operator (xor)',
+            '- At this hour (10) is work time',
+        ],
+    )
+    assert calendar.check(dti.date(2023, 1, 9)) == (1, '- Day is a holiday.')
+    assert calendar.check(dti.date(2023, 1, 8)) == (1, '- Day is weekend.')
+    assert calendar.next_workday(dti.date(2023, 1, 6) + dti.timedelta(days=1)) == dti.date(2023, 1, 7)
+    with pytest.raises(ValueError):
+        at.OffDays(operator='nand')
+
+
+def test_easter_sunday_known_dates():
+    assert at.easter_sunday(2008) == dti.date(2008, 3, 23)
+    assert at.easter_sunday(2024) == dti.date(2024, 3, 31)
+    assert at.easter_sunday(2025) == dti.date(2025, 4, 20)
+    assert at.easter_sunday(2038) == dti.date(2038, 4, 25)
+    assert at.easter_sunday(2285) == dti.date(2285, 3, 22)
+
+
+def test_nth_weekday_matches_stepping():
+    for year in (2023, 2024):
+        for month in range(1, 13):
+            for weekday in range(1, 8):
+                days = [
+                    day
+                    for day in at.days_of_year(dti.date(year, 1, 1))
+                    if (day.month, day.isoweekday()) == (month, weekday)
+                ]
+                for nth in range(1, 6):
+                    expected = days[nth - 1].toordinal() if nth <= len(days) else None
+                    assert at.nth_weekday(year, month, weekday, nth) == expected
+                    expected = days[-nth].toordinal() if nth <= len(days) else None
+                    assert at.nth_weekday(year, month, weekday, -nth) == expected
+
+
+def test_rule_days_per_year():
+    rules = ((at.RULE_FIXED, 2, 29), (at.RULE_EASTER, -300), (at.RULE_EASTER, 300), (at.RULE_NTH, 11, 4, 4))
+    assert [dti.date.fromordinal(ordinal) for ordinal in at.rule_days(rules, 2024)] == [
+        dti.date(2024, 2, 3),
+        dti.date(2024, 2, 29),
+        dti.date(2024, 6, 24),
+        dti.date(2024, 11, 28),
+    ]
+    assert dti.date(2023, 2, 28).toordinal() not in at.rule_days(rules, 2023)
+    assert at.rule_days(((at.RULE_EASTER, -2),), dti.MINYEAR)
+    with pytest.raises(ValueError, match='unknown rule kind'):
+        at.OffDays(rules=[('solstice', 0)])
+
+
+def test_calendar_holiday_rules_expand_only_queried_years():
+    error, _, holidays, working_hours = at.load(fix.CFG_PY_HOLIDAY_RULES)
+    assert not error
+    assert len(holidays.rules) == 7
+    assert len(holidays) == 4
+    calendar = at.Calendar(holidays, working_hours)
+    assert sorted(calendar.masks) == [2022]
+    for day in (dti.date(1999, 12, 24), dti.date(2031, 4, 11), dti.date(2031, 4, 14), dti.date(2031, 5, 26)):
+        assert calendar.is_holiday(day)
+        assert calendar.check(day, 10) == (1, '- Day is a holiday.')
+    assert calendar.is_holiday(dti.date(2022, 12, 28))
+    assert not calendar.is_holiday(dti.date(2031, 5, 19))
+    assert calendar.check(dti.date(2031, 5, 19), 10) == (0, '')
+    assert sorted(calendar.masks) == [1999, 2022, 2031]
+    assert calendar.next_workday(dti.date(2040, 3, 30)) == dti.date(2040, 4, 3)
+    thanksgiving = sum(1 for day in at.days_of_year(dti.date(2030, 1, 1)) if calendar.is_holiday(day))
+    assert thanksgiving == 7
+    assert repr(holidays).startswith('OffDays(intervals=[')
+    assert "('easter', -2)" in repr(holidays)
+    assert holidays != at.OffDays(intervals=holidays.intervals)
+
+
+def test_weekmask_parse_and_format():
+    assert at.parse_weekmask('1111100') == at.DEFAULT_WEEKMASK
+    assert at.format_weekmask(at.DEFAULT_WEEKMASK) == '1111100'
+    assert at.format_weekmask(at.parse_weekmask('1111001')) == '1111001'
+    assert [at.no_weekend(n) for n in range(1, 8)] == [True] * 5 + [False] * 2
+    assert [at.no_weekend(n, at.parse_weekmask('1111001')) for n in range(1, 8)] == [True] * 4 + [False] * 2 + [True]
+    for text in ('111110', '11111x0'):
+        with pytest.raises(ValueError, match='must be seven characters'):
+            at.parse_weekmask(text)
+    with pytest.raises(ValueError, match='at least one'):
+        at.OffDays(weekmask=0)
+
+
+def test_calendar_weekmask_matches_naive_sets():
+    listed = [dti.date(2023, 1, 6), dti.date(2023, 1, 9), dti.date(2023, 5, 1)]
+    days = at.days_of_year(dti.date(2023, 1, 1))
+    for text in ('1111001', '1111000', '0000001', '1111111'):
+        weekmask = at.parse_weekmask(text)
+        weekend = {day for day in days if text[day.weekday()] == '0'}
+        for operator, combine in (('or', set.union), ('and', set.intersection), ('xor', set.symmetric_difference)):
+            calendar = at.Calendar(at.OffDays(listed, operator=operator, weekmask=weekmask))
+            off = combine(weekend, set(listed))
+            assert [day for day in days if not calendar.is_workday(day)] == sorted(off), (text, operator)
+            assert calendar.workday_count(days[0], days[-1]) == len(days) - len(off)
+            assert [calendar.is_weekend(day) for day in days] == [day in weekend for day in days]
+
+
+def test_at_load_weekmask_friday_saturday_weekend():
+    error, _, holidays, working_hours = at.load({'operator': 'or', 'weekmask': '1111001'})
+    assert not error
+    assert repr(holidays) == "OffDays(intervals=[], weekmask='1111001')"
+    calendar = at.Calendar(holidays, working_hours)
+    friday, saturday, sunday = dti.date(2023, 1, 6), dti.date(2023, 1, 7), dti.date(2023, 1, 8)
+    assert calendar.check(friday, 10) == (1, '- Day is weekend.')
+    assert calendar.check(saturday, 10) == (1, '- Day is weekend.')
+    assert calendar.check(sunday, 10) == (0, '')
+    assert calendar.next_workday(friday) == sunday
+    assert calendar.busday_offset(dti.date(2023, 1, 5), 1) == sunday
+
+
+def test_parse_and_format_clock():
+    assert at.parse_clock('00:00') == 0
+    assert at.parse_clock('08:30') == 510
+    assert at.parse_clock('24:00') == at.MINUTES_PER_DAY
+    assert at.format_clock(510) == '08:30'
+    for text in ('8', '08:3', '08:60', 'ab:cd', '24:01'):
+        with pytest.raises(ValueError):
+            at.parse_clock(text)
+    assert at.merge_shifts([(720, 960), (480, 720), (500, 600)]) == ((480, 960),)
+    with pytest.raises(ValueError, match='non-empty interval'):
+        at.merge_shifts([(600, 600)])
+    with pytest.raises(ValueError, match='seven weekdays'):
+        at.OffDays(shifts=[[(480, 960)]])
+
+
+def test_calendar_shifts_per_weekday():
+    error, _, holidays, working_hours = at.load(fix.CFG_PY_SHIFTS)
+    assert not error
+    calendar = at.Calendar(holidays, working_hours)
+    assert calendar.shifts[0] == ((480, 720), (750, 990))
+    assert calendar.shifts[4] == ((480, 810),)
+    assert calendar.shifts[5] == at.hour_shifts((8, 17))
+    assert calendar.shift_minutes == (480, 480, 480, 480, 330, 600, 600)
+    monday, friday = dti.date(2023, 1, 9), dti.date(2023, 1, 13)
+    assert calendar.is_work_time(dti.datetime(2023, 1, 9, 11, 59))
+    assert not calendar.is_work_time(dti.datetime(2023, 1, 9, 12, 15))
+    assert calendar.is_work_time(dti.datetime(2023, 1, 9, 12, 30))
+    assert not calendar.is_work_time(dti.datetime(2023, 1, 13, 13, 30))
+    assert calendar.check(monday, 12, minute=15) == (1, '- No worktime at hour(12:15).')
+    assert calendar.check(monday, 12, minute=45) == (0, '')
+    assert calendar.check(friday, 16) == (1, '- No worktime at hour(16).')
+    assert calendar.next_transition(dti.datetime(2023, 1, 9, 11)) == dti.datetime(2023, 1, 9, 12)
+    assert calendar.next_transition(dti.datetime(2023, 1, 9, 12, 10)) == dti.datetime(2023, 1, 9, 12, 30)
+    assert calendar.next_transition(dti.datetime(2023, 1, 13, 14)) == dti.datetime(2023, 1, 16, 8)
+    assert calendar.window(friday) == (dti.datetime(2023, 1, 13, 8), dti.datetime(2023, 1, 13, 13, 30))
+    assert calendar.work_time_count(monday, friday) == 37
+    assert calendar.work_minutes_count(monday, friday) == 4 * 480 + 330
+
+
+def _naive_quarter_transition(calendar, moment):
+    state = calendar.is_work_time(moment)
+    probe = moment.replace(minute=moment.minute // 15 * 15, second=0, microsecond=0) + dti.timedelta(minutes=15)
+    while calendar.is_work_time(probe) == state:
+        probe += dti.timedelta(minutes=15)
+    return probe
+
+
+def test_calendar_shifts_next_transition_matches_stepping():
+    around_the_clock = [(0, 360), (1320, 1440)]
+    shift_sets = (
+        [[(480, 720), (750, 990)]] * 4 + [[(480, 810)], [], []],
+        [around_the_clock, around_the_clock, [(0, 1440)], [(0, 1440)], [(0, 600)], [], []],
+        [[(0, 1440)]] * 7,
+    )
+    holidays = [(dti.date(2023, 3, 1).toordinal(), dti.date(2023, 3, 3).toordinal())]
+    for shifts in shift_sets:
+        calendar = at.Calendar(at.OffDays(intervals=holidays, shifts=shifts), (8, 17))
+        for offset in range(0, 60 * 24 * 70, 97):
+            moment = dti.datetime(2023, 2, 1, 0, 5) + dti.timedelta(minutes=offset)
+            assert calendar.next_transition(moment) == _naive_quarter_transition(calendar, moment), moment
+
+
+def test_calendar_shifts_work_time_arithmetic_matches_stepping():
+    error, _, holidays, working_hours = at.load(fix.CFG_PY_SHIFTS)
+    calendar = at.Calendar(holidays, working_hours)
+    first = dti.datetime(2022, 12, 20, 7, 30)
+    for last in (
+        dti.datetime(2022, 12, 20, 12, 10),
+        dti.datetime(2022, 12, 23, 13, 0),
+        dti.datetime(2023, 1, 3, 8, 1),
+        dti.datetime(2023, 1, 16, 17, 59),
+    ):
+        expected = dti.timedelta(minutes=_naive_work_minutes(calendar, first, last))
+        assert calendar.work_time_between(first, last) == expected
+        assert calendar.work_time_between(last, first) == -expected
+        spent = calendar.add_work_time(first, expected)
+        assert spent <= last
+        assert _naive_work_minutes(calendar, first, spent) * 60 == expected.total_seconds()
+    moment = dti.datetime(2022, 6, 1, 9)
+    for hours in (1, 7, 40, 2_000, 20_000):
+        spent = calendar.add_work_time(moment, dti.timedelta(hours=hours))
+        assert calendar.work_time_between(moment, spent) == dti.timedelta(hours=hours)
+        assert calendar.is_work_time(spent - dti.timedelta(minutes=1))
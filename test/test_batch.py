@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=line-too-long,missing-docstring,reimported,unused-import,unused-variable
+import io
+import test.conftest as fix
+
+import pytest
+
+import arbejdstimer.arbejdstimer as at
+import arbejdstimer.batch as batch
+
+RECORDS = (
+    '2022-10-21',
+    '2022-10-21T08:00:00',
+    '2022-10-21 16:30:00+02:00',
+    '2022-10-21T18:00',
+    '2022-10-22T12:00:00',
+    '2022-12-27',
+    'tomorrow',
+)
+
+
+def _loaded():
+    _, _, holidays, working_hours = at.load(fix.CFG_PY_HOLIDAYS)
+    return holidays, working_hours
+
+
+def _calendar():
+    return at.Calendar(*_loaded())
+
+
+def test_classify_records():
+    calendar = _calendar()
+    assert [batch.classify(calendar, record) for record in RECORDS] == [
+        (0, ''),
+        (0, ''),
+        (0, ''),
+        (1, '- No worktime at hour(18).'),
+        (1, '- Day is weekend.'),
+        (1, '- Day is a holiday.'),
+        (2, '- Record is no ISO date or date time.'),
+    ]
+    assert batch.classify(calendar, '2345-11-13T12:00', strict=True)[0] == 2
+
+
+def test_classify_matches_apply(monkeypatch):
+    holidays, working_hours = _loaded()
+    monkeypatch.setattr(at, 'the_minute', lambda: 15)
+    for hour in (0, 7, 8, 12, 17, 18):
+        monkeypatch.setattr(at, 'the_hour', lambda: hour)
+        for day in ('2022-10-20', '2022-10-23', '2022-12-08', '2023-01-03'):
+            expected = at.apply(holidays, working_hours, 'now', day, False)
+            assert batch.classify(at.Calendar(holidays, working_hours), f'{day}T{hour:02d}:15') == expected
+
+
+def test_evaluate_is_lazy():
+    def lines():
+        yield '2022-12-27\n'
+        yield '\n'
+        raise RuntimeError('consumed beyond demand')
+
+    results = batch.evaluate(_calendar(), lines())
+    assert next(results) == '2022-12-27\t1\t- Day is a holiday.'
+    with pytest.raises(RuntimeError):
+        next(results)
+
+
+def test_batch_from_file(tmp_path, capsys):
+    source = tmp_path / 'records.txt'
+    source.write_text('\n'.join(RECORDS[:2]) + '\n', encoding=fix.ENCODING)
+    assert batch.batch(str(fix.CFG_FS_HOLIDAYS), str(source)) == 0
+    out, err = capsys.readouterr()
+    assert out == '2022-10-21\t0\t\n2022-10-21T08:00:00\t0\t\n'
+    assert not err
+
+
+def test_batch_from_stdin(monkeypatch, capsys):
+    monkeypatch.setattr('sys.stdin', io.StringIO('2022-12-27\n'))
+    assert batch.batch(str(fix.CFG_FS_HOLIDAYS)) == 0
+    assert capsys.readouterr().out == '2022-12-27\t1\t- Day is a holiday.\n'
+
+
+def test_batch_errors(tmp_path, capsys):
+    assert batch.batch(str(fix.CFG_FS_INVALID_MINIMAL)) == 2
+    assert batch.batch(str(fix.CFG_FS_NOT_THERE)) == 1
+    assert batch.batch(str(fix.CFG_FS_HOLIDAYS), str(tmp_path / 'missing.txt')) == 2
+    out, err = capsys.readouterr()
+    assert not out
+    assert 'not readable' in err
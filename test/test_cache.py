@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=line-too-long,missing-docstring,reimported,unused-import,unused-variable
+import datetime as dti
+import json
+import os
+import test.conftest as fix
+
+import arbejdstimer.arbejdstimer as at
+import arbejdstimer.cache as cache
+
+
+def _config(tmp_path, cfg=None):
+    path = tmp_path / 'holidays.json'
+    path.write_text(json.dumps(fix.CFG_PY_HOLIDAYS if cfg is None else cfg), encoding=fix.ENCODING)
+    return path
+
+
+def _fail_load_config(path):
+    raise AssertionError('configuration parsed despite compiled cache')
+
+
+def test_cache_dir_settings(monkeypatch, tmp_path):
+    monkeypatch.delenv(cache.CACHE_VAR, raising=False)
+    assert cache.cache_dir() is None
+    assert cache.cache_dir('') is None
+    assert cache.cache_dir(str(tmp_path)) == tmp_path
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    assert cache.cache_dir('xdg') == tmp_path / 'arbejdstimer'
+    monkeypatch.setenv(cache.CACHE_VAR, '1')
+    assert cache.cache_dir() == tmp_path / 'arbejdstimer'
+
+
+def test_cache_round_trip(tmp_path):
+    key = cache.cache_key(_config(tmp_path))
+    intervals = [(738000, 738010), (738100, 738100)]
+    assert cache.read(key, tmp_path) is None
+    assert cache.write(key, tmp_path, intervals, (8, 17))
+    assert cache.read(key, tmp_path) == (intervals, (8, 17), {})
+    assert cache.write(key, tmp_path, [], (None, None))
+    assert cache.read(key, tmp_path) == ([], (None, None), {})
+
+
+def test_cache_key_mismatch(tmp_path):
+    config = _config(tmp_path)
+    key = cache.cache_key(config)
+    cache.write(key, tmp_path, [(738000, 738010)], (8, 17))
+    stat = os.stat(config)
+    os.utime(config, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.read(cache.cache_key(config), tmp_path) is None
+    assert cache.loads(b'ATCC', key) is None
+    assert cache.loads(cache.dumps(key, [(1, 2)], (8, 17))[:-1], key) is None
+
+
+def test_at_main_uses_compiled_cache(monkeypatch, tmp_path, capsys):
+    config = _config(tmp_path)
+    monkeypatch.setenv(cache.CACHE_VAR, str(tmp_path / 'cache'))
+    action = ('explain', '2022-10-24', str(config), False)
+    assert at.main(action) == at.main(action)
+    out, _ = capsys.readouterr()
+    assert len(list((tmp_path / 'cache').glob(f'*{cache.CACHE_SUFFIX}'))) == 1
+    monkeypatch.setattr(at, 'load_config', _fail_load_config)
+    at.main(('explain', '2022-12-27', str(config), True))
+    out, err = capsys.readouterr()
+    assert 'consider 32 holidays' in out
+    assert '- Day is a holiday.' in out
+    assert not err
+
+
+def test_at_main_stale_cache_falls_back(monkeypatch, tmp_path, capsys):
+    config = _config(tmp_path)
+    monkeypatch.setenv(cache.CACHE_VAR, str(tmp_path / 'cache'))
+    at.main(('explain', '2022-12-27', str(config), False))
+    config.write_text(json.dumps({**fix.CFG_PY_HOLIDAYS, 'holidays': []}), encoding=fix.ENCODING)
+    os.utime(config, ns=(0, 0))
+    capsys.readouterr()
+    at.main(('explain', '2022-12-27', str(config), False))
+    out, _ = capsys.readouterr()
+    assert 'consider 0 holidays' in out
+
+
+def test_cache_keeps_operator(monkeypatch, tmp_path):
+    config = _config(tmp_path, {**fix.CFG_PY_HOLIDAYS, 'operator': 'xor'})
+    monkeypatch.setenv(cache.CACHE_VAR, str(tmp_path / 'cache'))
+    _, _, holidays, _, configuration = at.load_path(config)
+    assert configuration is not None
+    _, _, cached, _, configuration = at.load_path(config)
+    assert configuration is None
+    assert cached == holidays
+    assert cached.operator == 'xor'
+
+
+def test_cache_keeps_holiday_rules(monkeypatch, tmp_path):
+    config = _config(tmp_path, fix.CFG_PY_HOLIDAY_RULES)
+    monkeypatch.setenv(cache.CACHE_VAR, str(tmp_path / 'cache'))
+    _, _, holidays, _, configuration = at.load_path(config)
+    assert configuration is not None
+    _, _, cached, _, configuration = at.load_path(config)
+    assert configuration is None
+    assert cached == holidays
+    assert cached.rules == holidays.rules
+    assert at.Calendar(cached).is_holiday(dti.date(2031, 4, 11))
+
+
+def test_cache_keeps_weekmask(monkeypatch, tmp_path):
+    config = _config(tmp_path, {**fix.CFG_PY_HOLIDAYS, 'weekmask': '1111000'})
+    monkeypatch.setenv(cache.CACHE_VAR, str(tmp_path / 'cache'))
+    _, _, holidays, _, configuration = at.load_path(config)
+    assert configuration is not None
+    _, _, cached, _, configuration = at.load_path(config)
+    assert configuration is None
+    assert cached == holidays
+    assert at.format_weekmask(cached.weekmask) == '1111000'
+
+
+def test_cache_keeps_shifts(monkeypatch, tmp_path):
+    config = _config(tmp_path, fix.CFG_PY_SHIFTS)
+    monkeypatch.setenv(cache.CACHE_VAR, str(tmp_path / 'cache'))
+    _, _, holidays, working_hours, configuration = at.load_path(config)
+    assert configuration is not None
+    _, _, cached, _, configuration = at.load_path(config)
+    assert configuration is None
+    assert cached == holidays
+    assert at.Calendar(cached, working_hours).shifts == at.Calendar(holidays, working_hours).shifts
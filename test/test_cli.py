@@ -5,9 +5,17 @@ import test.conftest as fix
 import click
 import pytest
 
+import arbejdstimer.arbejdstimer as at
 import arbejdstimer.cli as cli
 
 
+@pytest.fixture(autouse=True)
+def work_time_now(monkeypatch):
+    """Pin the evaluation of now to a Monday at noon so the expected codes do not depend on the wall clock."""
+    monkeypatch.setattr(at, 'the_day', fix.a_working_monday)
+    monkeypatch.setattr(at, 'the_hour', fix.the_noon_hour)
+
+
 def test_version_ok(capsys):
     with pytest.raises(click.exceptions.Exit) as exec_info:
         assert cli.app_version() == 0
@@ -202,3 +210,74 @@ def test_existing_configuration_file_with_non_json_extension(capsys):
 
 def test_callback_with_version_false():
     assert cli.callback(False) is None
+
+
+def test_next_transition(capsys):
+    with pytest.raises(SystemExit) as exec_info:
+        cli.app_next(conf=str(fix.CFG_FS_HOLIDAYS), moment='2022-12-22T18:30')
+    assert exec_info.value.code == 1
+    out, err = capsys.readouterr()
+    assert out == '2023-01-03T08:00:00\n'
+    assert not err
+
+
+def test_next_transition_invalid_moment(capsys):
+    with pytest.raises(SystemExit) as exec_info:
+        cli.app_next(conf=str(fix.CFG_FS_HOLIDAYS), moment='tomorrow')
+    assert exec_info.value.code == 2
+    out, err = capsys.readouterr()
+    assert not out
+    assert 'received invalid date time (tomorrow)' in err
+
+
+def test_between_and_add(capsys):
+    with pytest.raises(SystemExit) as exec_info:
+        cli.app_between(conf=str(fix.CFG_FS_HOLIDAYS), first='2022-12-22T09:15', last='2023-01-04T10:00')
+    assert exec_info.value.code == 0
+    assert capsys.readouterr().out == '20:45\n'
+
+    with pytest.raises(SystemExit) as exec_info:
+        cli.app_add(conf=str(fix.CFG_FS_HOLIDAYS), moment='2022-12-22T09:15', duration='20:45')
+    assert exec_info.value.code == 0
+    assert capsys.readouterr().out == '2023-01-04T10:00:00\n'
+
+
+def test_add_negative_duration(capsys):
+    with pytest.raises(SystemExit) as exec_info:
+        cli.app_add(conf=str(fix.CFG_FS_HOLIDAYS), moment='2022-12-22T09:15', duration='-1')
+    assert exec_info.value.code == 2
+    assert 'received negative duration (-1)' in capsys.readouterr().err
+
+
+def test_at_main_explain_verbatim_weekmask(capsys, tmp_path):
+    config = tmp_path / 'weekmask.json'
+    config.write_text('{"operator": "or", "weekmask": "1111001"}', encoding=fix.ENCODING)
+    with pytest.raises(SystemExit) as exec_info:
+        cli.explain(conf=str(config), day='2023-01-06', verbose=True, strict=False)
+    assert exec_info.value.code == 1
+    out, err = capsys.readouterr()
+    message_parts = (
+        '- workdays of the week (Monday first):',
+        '  + 1111001 (from configuration)',
+        '- Day is weekend.',
+    )
+    for message_part in message_parts:
+        assert message_part in out
+    assert not err
+
+
+def test_at_main_explain_verbatim_shifts(capsys):
+    with pytest.raises(SystemExit) as exec_info:
+        cli.explain(conf=fix.CFG_FS_SHIFTS, day='2023-01-13', verbose=True, strict=False)
+    assert exec_info.value.code == 0
+    out, err = capsys.readouterr()
+    message_parts = (
+        '- shifts per weekday (replacing the working hours where given):',
+        '  + Mon [08:00, 12:00), [12:30, 16:30)',
+        '  + Fri [08:00, 13:30)',
+        '- At this hour (12) is work time',
+    )
+    for message_part in message_parts:
+        assert message_part in out
+    assert '  + Sat' not in out
+    assert not err
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=line-too-long,missing-docstring,reimported,unused-import,unused-variable
+import json
+import os
+import pathlib
+import subprocess  # nosec
+import sys
+import test.conftest as fix
+
+import pytest
+
+import arbejdstimer.arbejdstimer as at
+import arbejdstimer.cache as cache
+import arbejdstimer.fast as fast
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+HEAVY_MODULES = ('click', 'pydantic', 'typer')
+IMPORT_BUDGET_US = 100_000  # Importing typer and pydantic alone takes well above this
+PROBE = """\
+import json, sys
+from arbejdstimer.fast import main
+code = main(sys.argv[1:])
+print(json.dumps({'code': code, 'heavy': sorted(m for m in %r if m in sys.modules)}))
+"""
+
+
+def _probe(args, cache_folder):
+    env = {**os.environ, cache.CACHE_VAR: str(cache_folder), 'PYTHONPATH': str(ROOT)}
+    process = subprocess.run(  # nosec
+        [sys.executable, '-X', 'importtime', '-c', PROBE % (HEAVY_MODULES,), *args],
+        capture_output=True,
+        cwd=ROOT,
+        env=env,
+        text=True,
+        check=False,
+    )
+    result = json.loads(process.stdout.strip().split('\n')[-1])
+    cumulative = {}
+    for line in process.stderr.split('\n'):
+        if line.startswith('import time:') and '|' in line:
+            _, cumulative_us, name = (part.strip() for part in line.split(':', 1)[1].split('|'))
+            if cumulative_us.isdigit():
+                cumulative[name] = int(cumulative_us)
+    return result, cumulative
+
+
+def test_fast_parse_now():
+    config = str(fix.CFG_FS_HOLIDAYS)
+    assert fast.parse(['now', '-c', config]) == ('now', '', config, False)
+    assert fast.parse(['now', f'--config={config}', '--strict']) == ('now', '', config, True)
+    assert fast.parse(['now', '-s'])[2].endswith(at.DEFAULT_CONFIG_NAME)  # type: ignore
+
+
+def test_fast_parse_explain():
+    config = str(fix.CFG_FS_HOLIDAYS)
+    expected = ('explain_verbatim', '2022-10-22', config, True)
+    assert fast.parse(['explain', '-v', '-d', '2022-10-22', '-c', config, '-s']) == expected
+    assert fast.parse(['explain', '--day=2022-10-22', '--config', config]) == ('explain', '2022-10-22', config, False)
+
+
+def test_fast_parse_delegates():
+    assert fast.parse([]) is None
+    assert fast.parse(['template']) is None
+    assert fast.parse(['now', '-d', '2022-10-22']) is None
+    assert fast.parse(['now', '-h']) is None
+    assert fast.parse(['explain', '-c']) is None
+    assert fast.parse(['explain', '--strict=yes']) is None
+
+
+def test_fast_main_explain(capsys):
+    assert fast.main(['explain', '-d', '2022-12-27', '-c', str(fix.CFG_FS_HOLIDAYS)]) == 1
+    out, err = capsys.readouterr()
+    assert 'consider 32 holidays' in out
+    assert '- Day is a holiday.' in out
+    assert not err
+
+
+def test_fast_main_delegates_to_typer():
+    with pytest.raises(SystemExit) as exec_info:
+        fast.main(['template'])
+    assert exec_info.value.code == 0
+
+
+def test_fast_now_import_budget(tmp_path):
+    config = tmp_path / 'holidays.json'
+    config.write_text(json.dumps(fix.CFG_PY_HOLIDAYS), encoding=fix.ENCODING)
+    args = ['explain', '-d', '2022-12-27', '-c', str(config)]
+
+    result, _ = _probe(args, tmp_path / 'cache')
+    assert result['code'] == 1
+    assert 'pydantic' in result['heavy']
+
+    result, cumulative = _probe(args, tmp_path / 'cache')
+    assert result == {'code': 1, 'heavy': []}
+    assert cumulative['arbejdstimer.fast'] < IMPORT_BUDGET_US
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=line-too-long,missing-docstring,reimported,unused-import,unused-variable
+import pathlib
+import shutil
+import socket
+import tempfile
+import test.conftest as fix
+import threading
+
+import pytest
+
+import arbejdstimer.arbejdstimer as at
+import arbejdstimer.fast as fast
+import arbejdstimer.server as server
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='requires Unix domain sockets')
+
+
+@pytest.fixture()
+def socket_path():
+    folder = pathlib.Path(tempfile.mkdtemp(prefix='at-'))  # Short paths as Unix socket paths are limited
+    yield folder / 'test.sock'
+    shutil.rmtree(folder, ignore_errors=True)
+
+
+@pytest.fixture()
+def running(socket_path):
+    _, _, holidays, working_hours = at.load(fix.CFG_PY_HOLIDAYS)
+    daemon = server.QueryServer(socket_path, at.Calendar(holidays, working_hours))
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    yield socket_path
+    daemon.shutdown()
+    daemon.server_close()
+    thread.join()
+
+
+def test_parse_request():
+    assert server.parse_request('now\n') == (0, '', ('now', '', False))
+    assert server.parse_request('explain 2022-10-22 strict') == (0, '', ('explain', '2022-10-22', True))
+    assert server.parse_request('') == (2, 'received unknown command', ('', '', False))
+    assert server.parse_request('explain 2022-13-22')[0] == 2
+    assert server.parse_request('now 2022-10-22 2022-10-23')[:2] == (2, 'received unknown argument')
+    assert server.request_line('explain', '2022-10-22', True) == 'explain 2022-10-22 strict\n'
+
+
+def test_query_holiday(running):
+    assert server.query('explain', '2022-12-27', False, running) == (1, ['- Day is a holiday.'])
+    assert server.query('now', '2022-12-24', True, running) == (1, ['- Day is a holiday.'])
+    assert server.query('now', '2345-11-13', True, running) == (2, ['- Day is not within year range of configuration'])
+
+
+def test_query_matches_main(running, capsys):
+    for day in ('2022-10-22', '2022-12-27', '2023-03-01'):
+        expected = at.main(('explain', day, str(fix.CFG_FS_HOLIDAYS), False))
+        assert server.ask('explain', day, False, running) == expected
+
+
+def test_ask_prints_only_when_explaining(running, capsys):
+    assert server.ask('now', '2022-12-27', False, running) == 1
+    assert capsys.readouterr() == ('', '')
+    assert fast.main(['ask', 'explain', '-d', '2022-12-27', f'--socket={running}']) == 1
+    out, err = capsys.readouterr()
+    assert out == '- Day is a holiday.\n'
+    assert not err
+
+
+def test_ask_without_server(socket_path, capsys):
+    assert server.ask('now', '', False, socket_path) == 2
+    out, err = capsys.readouterr()
+    assert not out
+    assert 'no arbejdstimer server answering' in err
+
+
+def test_remove_stale_socket(socket_path):
+    assert server.remove_stale_socket(socket_path)
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+        stale.bind(str(socket_path))
+    assert socket_path.exists()
+    assert server.remove_stale_socket(socket_path)
+    assert not socket_path.exists()
+    socket_path.write_text('not a socket', encoding=fix.ENCODING)
+    assert not server.remove_stale_socket(socket_path)
+
+
+def test_serve_invalid_config(socket_path, capsys):
+    assert server.serve(str(fix.CFG_FS_INVALID_MINIMAL), socket_path) == 2
+    assert server.serve(str(fix.CFG_FS_NOT_THERE), socket_path) == 1
+    out, err = capsys.readouterr()
+    assert 'Configuration file failed to parse (INVALID)' in err
+    assert not out
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=line-too-long,missing-docstring,reimported,unused-import,unused-variable
+import io
+import json
+import test.conftest as fix
+
+import arbejdstimer.arbejdstimer as at
+import arbejdstimer.batch as batch
+import arbejdstimer.cache as cache
+import arbejdstimer.trace as trace
+
+
+def test_tracer_settings(monkeypatch):
+    monkeypatch.delenv(trace.DEBUG_VAR, raising=False)
+    assert trace.tracer(at_exit=False) is None
+    assert trace.tracer('', at_exit=False) is None
+    assert trace.tracer('0', at_exit=False) is None
+    assert not trace.tracer('1', at_exit=False).as_json  # type: ignore
+    assert trace.tracer('JSON', at_exit=False).as_json  # type: ignore
+
+
+def test_trace_dump_text_and_json():
+    recorder = trace.Trace()
+    recorder.stop('phase', recorder.start())
+    recorder.stop('phase', recorder.start())
+    recorder.count('things', 3)
+    recorder.count('things')
+    stream = io.StringIO()
+    recorder.dump(stream)
+    lines = stream.getvalue().splitlines()
+    assert lines[0].startswith(f'{trace.PREFIX} phase phase ') and lines[0].endswith(' ms in 2 call(s)')
+    assert lines[1] == f'{trace.PREFIX} count things 4'
+    assert lines[2].startswith(f'{trace.PREFIX} total ')
+
+    recorder = trace.Trace(as_json=True)
+    recorder.count('things')
+    stream = io.StringIO()
+    recorder.dump(stream)
+    document = json.loads(stream.getvalue())
+    assert document['counts'] == {'things': 1}
+    assert document['phases'] == {}
+
+
+def test_trace_load_path_phases_and_counts(monkeypatch, tmp_path):
+    recorder = trace.Trace()
+    monkeypatch.setattr(at, 'TRACE', recorder)
+    monkeypatch.setenv(cache.CACHE_VAR, str(tmp_path))
+    error, _, holidays, _, _ = at.load_path(fix.CFG_FS_HOLIDAYS)
+    assert not error
+    assert set(recorder.phases) == {'cache_read', 'load_config', 'import_models', 'validate', 'expand', 'cache_write'}
+    assert recorder.counts == {
+        'cache_misses': 1,
+        'holiday_entries': len(fix.CFG_PY_HOLIDAYS['holidays']),
+        'holiday_intervals': len(holidays.intervals),
+        'holiday_days': len(holidays),
+        'holiday_rules': 0,
+    }
+
+    at.load_path(fix.CFG_FS_HOLIDAYS)
+    assert recorder.counts['cache_hits'] == 1
+    assert recorder.phases['load_config'][1] == 1
+
+
+def test_trace_batch_counts_dates_checked(monkeypatch, capsys):
+    recorder = trace.Trace()
+    monkeypatch.setattr(at, 'TRACE', recorder)
+    _, _, holidays, working_hours = at.load(fix.CFG_PY_HOLIDAYS)
+    assert batch.stream(at.Calendar(holidays, working_hours), io.StringIO('2022-12-08\n2022-10-24T12:00\n')) == 2
+    assert recorder.counts['dates_checked'] == 2
+    assert recorder.phases['evaluate'][1] == 1
+
+
+def test_trace_disabled_writes_nothing(monkeypatch, capsys):
+    monkeypatch.setattr(at, 'TRACE', None)
+    monkeypatch.delenv(cache.CACHE_VAR, raising=False)
+    at.load_path(fix.CFG_FS_HOLIDAYS)
+    assert capsys.readouterr().err == ''
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=line-too-long,missing-docstring,reimported,unused-import,unused-variable
+import datetime as dti
+import test.conftest as fix
+
+import pytest
+
+import arbejdstimer.arbejdstimer as at
+
+np = pytest.importorskip('numpy')
+vec = pytest.importorskip('arbejdstimer.vectorized')
+
+
+def _loaded():
+    _, _, holidays, working_hours = at.load(fix.CFG_PY_HOLIDAYS)
+    return holidays, working_hours
+
+
+def test_days_of_year_matches_reference():
+    for year in (1900, 2020, 2022):
+        assert vec.days_of_year(year).tolist() == at.days_of_year(dti.date(year, 1, 1))
+
+
+def test_iso_weekdays_matches_reference():
+    days = [dti.date(1969, 12, 25) + dti.timedelta(days=n) for n in range(30)]
+    assert vec.iso_weekdays(days).tolist() == [at.weekday(day) for day in days]
+
+
+def test_workday_mask_matches_reference():
+    holidays, _ = _loaded()
+    for year in (2021, 2022, 2023, 2024):
+        days = at.days_of_year(dti.date(year, 1, 1))
+        expected = [at.workday(holidays, 'now', day)[0] == 0 for day in days]
+        assert vec.workday_mask(holidays, days).tolist() == expected
+        assert vec.workdays(holidays, vec.days_of_year(year)).tolist() == at.workdays(holidays, days)
+        assert vec.workday_count(holidays, days) == sum(expected)
+
+
+def test_holiday_mask_plain_and_empty():
+    days = vec.days_of_year(2022)
+    assert not vec.holiday_mask([], days).any()
+    mask = vec.holiday_mask([dti.date(2022, 12, 24), dti.date(2022, 12, 25)], days)
+    assert days[mask].tolist() == [dti.date(2022, 12, 24), dti.date(2022, 12, 25)]
+
+
+def test_work_time_mask_matches_reference():
+    holidays, working_hours = _loaded()
+    start = np.datetime64('2022-12-20T00:00', 'm')
+    moments = start + np.arange(0, 14 * 24 * 60, 37).astype('timedelta64[m]')
+    for hours in (working_hours, at.DEFAULT_WORK_HOURS_MARKER):
+        expected = [
+            at.apply(holidays, hours, 'now', moment.date(), False, hour=moment.hour)[0] == 0
+            for moment in moments.tolist()
+        ]
+        assert vec.work_time_mask(holidays, hours, moments).tolist() == expected
+        assert vec.work_time_count(holidays, hours, moments) == sum(expected)
+
+
+def _calendar_and_numpy_holidays():
+    holidays, working_hours = _loaded()
+    return at.Calendar(holidays, working_hours), np.array(holidays.dates(), dtype='datetime64[D]')
+
+
+def test_busday_offset_matches_numpy():
+    calendar, holidays = _calendar_and_numpy_holidays()
+    days = vec.days_of_year(2022)
+    offsets = np.arange(days.size) % 41 - 20 + (np.arange(days.size) % 3) * 300
+    for roll in ('forward', 'backward', 'modifiedfollowing', 'modifiedpreceding'):
+        expected = np.busday_offset(days, offsets, roll=roll, holidays=holidays)
+        assert vec.busday_offset(calendar, days, offsets, roll=roll).tolist() == expected.tolist()
+        assert [
+            calendar.busday_offset(day, int(offset), roll) for day, offset in zip(days.tolist(), offsets.tolist())
+        ] == expected.tolist()
+
+
+def test_busday_roll_raise_matches_numpy():
+    calendar, holidays = _calendar_and_numpy_holidays()
+    workdays = vec.workdays(calendar.holidays, vec.days_of_year(2023))
+    assert vec.busday_roll(calendar, workdays, roll='raise').tolist() == workdays.tolist()
+    with pytest.raises(ValueError):
+        vec.busday_roll(calendar, ['2022-12-24'], roll='raise')
+    with pytest.raises(ValueError):
+        vec.busday_roll(calendar, ['2022-12-24'], roll='sideways')
+
+
+def test_busday_count_matches_numpy():
+    calendar, holidays = _calendar_and_numpy_holidays()
+    begins = vec.days_of_year(2022)
+    ends = begins + (np.arange(begins.size) * 7 % 900 - 200)
+    expected = np.busday_count(begins, ends, holidays=holidays)
+    assert vec.busday_count(calendar, begins, ends).tolist() == expected.tolist()
+    assert [calendar.busday_count(b, e) for b, e in zip(begins.tolist(), ends.tolist())] == expected.tolist()
+
+
+def test_workday_mask_honours_operator():
+    days = vec.days_of_year(2022)
+    for operator in ('and', 'or', 'xor'):
+        holidays = at.OffDays(intervals=at.holiday_index(_loaded()[0]).intervals, operator=operator)
+        calendar = at.Calendar(holidays)
+        assert vec.workday_mask(holidays, days).tolist() == [calendar.is_workday(day) for day in days.tolist()]
+        assert vec.busday_count(calendar, '2022-01-01', '2023-01-01') == calendar.workday_count(
+            dti.date(2022, 1, 1), dti.date(2022, 12, 31)
+        )
+
+
+def test_workday_mask_honours_holiday_rules():
+    _, _, holidays, _ = at.load(fix.CFG_PY_HOLIDAY_RULES)
+    calendar = at.Calendar(holidays)
+    days = vec.as_days(['2030-12-20', '2031-01-01', '2031-04-11', '2031-05-26', '2031-12-24', '2032-11-25'])
+    assert vec.holiday_mask(holidays, days).tolist() == [False, True, True, True, True, True]
+    days = np.arange('2029-12-01', '2032-02-01', dtype='datetime64[D]')
+    assert vec.workday_mask(holidays, days).tolist() == [calendar.is_workday(day) for day in days.tolist()]
+    assert vec.rule_days(holidays, days[:0]).size == 0
+
+
+def test_workday_mask_honours_weekmask_like_numpy():
+    days = vec.days_of_year(2022)
+    for text in ('1111001', '1111000', '0100000'):
+        holidays = at.OffDays(intervals=at.holiday_index(_loaded()[0]).intervals, weekmask=at.parse_weekmask(text))
+        calendar = at.Calendar(holidays)
+        expected = np.is_busday(days, weekmask=text, holidays=vec.as_days(holidays.dates()))
+        assert vec.workday_mask(holidays, days).tolist() == expected.tolist()
+        assert vec.weekend_mask(days, holidays.weekmask).tolist() == [calendar.is_weekend(d) for d in days.tolist()]
+        assert vec.busday_count(calendar, '2022-01-01', '2023-01-01') == np.busday_count(
+            '2022-01-01', '2023-01-01', weekmask=text, holidays=vec.as_days(holidays.dates())
+        )
+
+
+def test_work_time_mask_honours_shifts():
+    _, _, holidays, working_hours = at.load(fix.CFG_PY_SHIFTS)
+    calendar = at.Calendar(holidays, working_hours)
+    moments = np.arange('2022-12-19T00:00', '2023-01-10T00:00', 7, dtype='datetime64[m]')
+    expected = [calendar.is_work_time(moment) for moment in moments.tolist()]
+    assert vec.work_time_mask(holidays, working_hours, moments).tolist() == expected
+    assert vec.work_time_count(holidays, working_hours, moments) == sum(expected)